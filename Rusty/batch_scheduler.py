@@ -0,0 +1,94 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+class BatchScheduler:
+    """Collects summarize calls from concurrent callers and runs them as shared batches.
+
+    The first pending call opens a window of window_ms; everything that arrives
+    before it closes (or until max_batch calls are queued) is grouped by its
+    generation settings and handed to run_batch(texts, max_length, min_length)
+    in one call. Each caller gets its own result back through a Future.
+
+    With max_inflight > 1 (e.g. one per model worker process), up to that many
+    batches run at once while the next one keeps filling up.
+    """
+
+    def __init__(self, run_batch, window_ms=5, max_batch=16, max_inflight=1):
+        self.run_batch = run_batch
+        self.window = window_ms / 1000.0
+        self.max_batch = max_batch
+        self._pending = []
+        self._cond = threading.Condition()
+        self._closed = False
+        self._inflight = threading.BoundedSemaphore(max_inflight)
+        self._runner = ThreadPoolExecutor(max_workers=max_inflight, thread_name_prefix='summary-batch') if max_inflight > 1 else None
+        self.stats = {'calls': 0, 'batches': 0}
+        self._worker = threading.Thread(target=self._loop, name='summary-batcher', daemon=True)
+        self._worker.start()
+
+    def submit(self, text, max_length=40, min_length=10):
+        future = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError('BatchScheduler is closed')
+            self._pending.append((text, max_length, min_length, future))
+            self.stats['calls'] += 1
+            self._cond.notify()
+        return future
+
+    def summarize(self, text, max_length=40, min_length=10):
+        return self.submit(text, max_length, min_length).result()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._worker.join()
+        if self._runner is not None:
+            self._runner.shutdown(wait=True)
+
+    def _take_batch(self):
+        with self._cond:
+            while not self._pending and not self._closed:
+                self._cond.wait()
+            if not self._pending:
+                return None
+            deadline = time.monotonic() + self.window
+            while len(self._pending) < self.max_batch and not self._closed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            batch, self._pending = self._pending[:self.max_batch], self._pending[self.max_batch:]
+            return batch
+
+    def _loop(self):
+        while True:
+            batch = self._take_batch()
+            if batch is None:
+                return
+            # Calls with different generation settings can't share a forward pass
+            groups = {}
+            for item in batch:
+                groups.setdefault((item[1], item[2]), []).append(item)
+            for (max_length, min_length), items in groups.items():
+                self.stats['batches'] += 1
+                # Blocks while max_inflight batches are running, letting the next batch grow
+                self._inflight.acquire()
+                if self._runner is None:
+                    self._run_group(items, max_length, min_length)
+                else:
+                    self._runner.submit(self._run_group, items, max_length, min_length)
+
+    def _run_group(self, items, max_length, min_length):
+        try:
+            results = self.run_batch([item[0] for item in items], max_length, min_length)
+        except Exception as e:
+            for item in items:
+                item[3].set_exception(e)
+            return
+        finally:
+            self._inflight.release()
+        for item, result in zip(items, results):
+            item[3].set_result(result)
@@ -0,0 +1,95 @@
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+
+class ExpiringLRU:
+    """Bounded key -> (value, expires_at) map, least recently used first.
+
+    Not locked itself: the owning cache guards it with its own lock, together
+    with whatever else it keeps in step (stats, indexes). on_evict(key, value)
+    is called whenever an entry leaves other than through clear().
+    """
+
+    def __init__(self, max_entries, on_evict=None):
+        self.max_entries = max_entries
+        self.on_evict = on_evict
+        self._entries = OrderedDict()
+
+    def get(self, key, now):
+        """The live value for key (marking it recently used), or None; an expired entry is dropped."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at <= now:
+            self.pop(key)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def entry(self, key):
+        """(value, expires_at) for key without touching recency, or None."""
+        return self._entries.get(key)
+
+    def touch(self, key):
+        self._entries.move_to_end(key)
+
+    def put(self, key, value, expires_at):
+        if key in self._entries:
+            self.pop(key)
+        self._entries[key] = (value, expires_at)
+        while len(self._entries) > self.max_entries:
+            self.pop(next(iter(self._entries)))
+
+    def pop(self, key):
+        value, _ = self._entries.pop(key)
+        if self.on_evict is not None:
+            self.on_evict(key, value)
+
+    def purge(self, now):
+        for key in [k for k, (_, expires_at) in self._entries.items() if expires_at <= now]:
+            self.pop(key)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+class SQLiteStore:
+    """The shared SQLite file behind an in-process cache, with one connection per thread.
+
+    schema is a list of statements (CREATE TABLE/INDEX IF NOT EXISTS) run on open.
+    The disk tier is best-effort: if the file can't be created or the schema
+    applied, enabled is False and the cache keeps working memory-only.
+    """
+
+    def __init__(self, path, schema):
+        self.path = path or None
+        self._local = threading.local()
+        if self.path:
+            try:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                conn = self.connection()
+                for statement in schema:
+                    conn.execute(statement)
+                conn.commit()
+            except Exception:
+                self.path = None
+
+    @property
+    def enabled(self):
+        return self.path is not None
+
+    def connection(self):
+        # sqlite3 connections can't be shared across threads, so keep one per thread
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
@@ -0,0 +1,133 @@
+import os
+import threading
+import time
+from cache_store import ExpiringLRU, SQLiteStore
+from instrumentation import incr
+
+DEFAULT_CACHE_PATH = os.environ.get(
+    'RUSTY_CONTEXT_CACHE',
+    os.path.join(os.path.expanduser('~'), '.cache', 'veridejargon', 'contexts.sqlite3')
+)
+
+# Sentinel stored for lookups that found nothing, so misses are cached too
+MISS = object()
+
+class ContextCache:
+    """Two-tier keyword -> context cache: an in-process LRU in front of a shared SQLite file."""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_entries=4096, ttl=7 * 24 * 3600, negative_ttl=3600):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._memory = ExpiringLRU(max_entries)
+        self._lock = threading.Lock()
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'negative_hits': 0, 'stores': 0}
+        self._disk = SQLiteStore(path, [
+            'CREATE TABLE IF NOT EXISTS contexts ('
+            'keyword TEXT PRIMARY KEY, context TEXT, expires_at REAL NOT NULL)'
+        ])
+
+    @staticmethod
+    def _key(keyword):
+        return ' '.join(keyword.lower().split())
+
+    def get(self, keyword):
+        """Return the cached context, MISS for a cached negative result, or None if unknown."""
+        key = self._key(keyword)
+        now = time.time()
+        with self._lock:
+            value = self._memory.get(key, now)
+            if value is not None:
+                self.stats['memory_hits'] += 1
+                if value is MISS:
+                    self.stats['negative_hits'] += 1
+        if value is not None:
+            incr('context_cache_hits')
+            return value
+        if self._disk.enabled:
+            try:
+                row = self._disk.connection().execute(
+                    'SELECT context, expires_at FROM contexts WHERE keyword = ?', (key,)
+                ).fetchone()
+            except Exception:
+                row = None
+            if row is not None and row[1] > now:
+                value = MISS if row[0] is None else row[0]
+                with self._lock:
+                    self._memory.put(key, value, row[1])
+                    self.stats['disk_hits'] += 1
+                    if value is MISS:
+                        self.stats['negative_hits'] += 1
+                incr('context_cache_hits')
+                return value
+        with self._lock:
+            self.stats['misses'] += 1
+        incr('context_cache_misses')
+        return None
+
+    def set(self, keyword, context):
+        """Store a context; a falsy context is recorded as a negative (miss) entry."""
+        key = self._key(keyword)
+        value = context if context else MISS
+        expires_at = time.time() + (self.ttl if value is not MISS else self.negative_ttl)
+        with self._lock:
+            self._memory.put(key, value, expires_at)
+            self.stats['stores'] += 1
+        if self._disk.enabled:
+            try:
+                conn = self._disk.connection()
+                conn.execute(
+                    'INSERT OR REPLACE INTO contexts (keyword, context, expires_at) VALUES (?, ?, ?)',
+                    (key, None if value is MISS else value, expires_at)
+                )
+                conn.commit()
+            except Exception:
+                pass
+
+    def get_or_fetch(self, keyword, fetch):
+        """Return the context for keyword, calling fetch(keyword) only on a cache miss."""
+        cached = self.get(keyword)
+        if cached is MISS:
+            return None
+        if cached is not None:
+            return cached
+        context = fetch(keyword)
+        self.set(keyword, context)
+        return context
+
+    def purge_expired(self):
+        """Drop expired rows from both tiers."""
+        now = time.time()
+        with self._lock:
+            self._memory.purge(now)
+        if self._disk.enabled:
+            conn = self._disk.connection()
+            conn.execute('DELETE FROM contexts WHERE expires_at <= ?', (now,))
+            conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+        if self._disk.enabled:
+            conn = self._disk.connection()
+            conn.execute('DELETE FROM contexts')
+            conn.commit()
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats['memory_entries'] = len(self._memory)
+        lookups = stats['memory_hits'] + stats['disk_hits'] + stats['misses']
+        stats['hit_rate'] = (stats['memory_hits'] + stats['disk_hits']) / lookups if lookups else 0.0
+        return stats
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+def get_shared_cache():
+    """Process-wide cache instance shared by every KeywordDejargonifier."""
+    global _shared_cache
+    if _shared_cache is None:
+        with _shared_lock:
+            if _shared_cache is None:
+                _shared_cache = ContextCache()
+    return _shared_cache
@@ -0,0 +1,84 @@
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from instrumentation import METRICS, incr
+
+# Safety factor on a stage's mean historical duration when deciding whether it still fits
+ESTIMATE_MARGIN = 1.5
+
+def expected_seconds(stage, default):
+    """How long stage usually takes, from the process-wide span metrics (default before any data)."""
+    stats = METRICS.snapshot()["spans"].get(stage)
+    if not stats:
+        return default
+    return stats["mean"] * ESTIMATE_MARGIN
+
+class Deadline:
+    """A request's latency budget, consulted by stages to decide how much work still fits.
+
+    budget_ms=None means no budget: every stage runs at full fidelity and only
+    its own fixed timeout caps apply. Stages that had to cut corners record
+    themselves with degrade(), and the list goes back in the response.
+    """
+
+    def __init__(self, budget_ms=None):
+        self.budget_ms = budget_ms
+        self.expires_at = None if budget_ms is None else time.monotonic() + budget_ms / 1000.0
+        self.degraded = []
+        self._lock = threading.Lock()
+
+    @property
+    def unlimited(self):
+        return self.expires_at is None
+
+    def remaining(self, reserve=0.0):
+        """Seconds left after setting aside reserve for later stages; None without a budget."""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic() - reserve)
+
+    def expired(self):
+        return self.expires_at is not None and time.monotonic() >= self.expires_at
+
+    def timeout(self, cap=None, reserve=0.0):
+        """A timeout for a blocking wait: the remaining budget, but never more than cap."""
+        remaining = self.remaining(reserve)
+        if remaining is None:
+            return cap
+        return remaining if cap is None else min(cap, remaining)
+
+    def allows(self, stage, default, reserve=0.0):
+        """Whether stage, at its usual duration, still fits before the deadline minus reserve."""
+        if self.expires_at is None:
+            return True
+        return self.remaining(reserve) >= expected_seconds(stage, default)
+
+    def degrade(self, stage):
+        """Record that stage ran at reduced fidelity (or was skipped) to meet the deadline."""
+        with self._lock:
+            if stage in self.degraded:
+                return
+            self.degraded.append(stage)
+        incr("degraded_stages")
+
+_current = contextvars.ContextVar('rusty_deadline', default=None)
+
+def current_deadline():
+    """The enclosing request's Deadline, or an unlimited one outside any deadline scope."""
+    deadline = _current.get()
+    return deadline if deadline is not None else Deadline()
+
+@contextmanager
+def deadline_scope(budget_ms=None):
+    """Run the enclosed work under a budget; without budget_ms an enclosing scope is reused."""
+    deadline = _current.get()
+    if deadline is not None and budget_ms is None:
+        yield deadline
+        return
+    deadline = Deadline(budget_ms)
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current.reset(token)
@@ -1,53 +1,125 @@
 import sys
-from textblob import Word
 from init_summarizer import compress_sentences
-from keyword_dejargonifier import KeywordDejargonifier
+from keyword_dejargonifier import get_dejargonifier, ensure_nltk_data
+from simple_lexicon import SIMPLE_WORDS, get_simple_lexicon
+from instrumentation import submit
+from deadline import current_deadline
+from document import Document
 
 class DebateAnalyzer:
-    def __init__(self):
-        self.dejargonifier = KeywordDejargonifier()
+    def __init__(self, dejargonifier=None):
+        self.dejargonifier = dejargonifier or get_dejargonifier()
 
     def _assign_weight_single(self, line):
         """Assign confidence weight to a single line (fact-checking and citations)."""
         keywords = self.dejargonifier.extract_keywords(line)
+        contexts = {kw: self.dejargonifier.fetch_context(kw) for kw in keywords}
+        return self._score_line(line, keywords, contexts)
+
+    def _score_line(self, line, keywords, contexts):
+        """Weigh a line against already-resolved keyword contexts; no network access."""
+        doc = Document.of(line)
         found_contexts = []
         citations = []
         for kw in keywords:
-            context = self.dejargonifier.fetch_context(kw)
+            context = contexts.get(kw)
             if context:
                 found_contexts.append(context)
                 citations.append(f"{kw}: {context[:80]}...")
         confidence = 0.5
         for ctx in found_contexts:
-            if ctx and any(word in ctx.lower() for word in line.lower().split()):
+            ctx_lower = ctx.lower()
+            if any(word in ctx_lower for word in doc.words):
                 confidence += 0.2
         if not found_contexts:
             confidence -= 0.2
         confidence = max(0.0, min(1.0, confidence))
         if citations:
-            line_with_cite = line + "\n[Citations: " + "; ".join(citations) + "]"
+            line_with_cite = doc.text + "\n[Citations: " + "; ".join(citations) + "]"
         else:
-            line_with_cite = line
+            line_with_cite = doc.text
         return (line_with_cite, confidence)
 
-    def assign_weights(self, lines):
-        """Assign confidence weights to each line in parallel."""
+    def resolve_contexts(self, keywords, max_workers=6, on_resolved=None, reserve=0.0, stage="weighting"):
+        """Fetch the context for each distinct keyword once, at most max_workers at a time.
+
+        on_resolved(keyword, context) is called as each lookup finishes, in completion order.
+        Under a request deadline, lookups still pending when only reserve seconds are
+        left are cancelled and resolve to None, and stage is marked degraded.
+        """
         import concurrent.futures
-        weighted = []
-        with concurrent.futures.ThreadPoolExecutor(max_workers=6) as executor:
-            results = list(executor.map(self._assign_weight_single, lines))
+        keywords = list(dict.fromkeys(keywords))
+        contexts = {}
+        if not keywords:
+            return contexts
+        deadline = current_deadline()
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            futures = {submit(executor, self.dejargonifier.fetch_context, kw): kw for kw in keywords}
+            try:
+                for future in concurrent.futures.as_completed(futures, timeout=deadline.timeout(reserve=reserve)):
+                    kw = futures[future]
+                    try:
+                        contexts[kw] = future.result()
+                    except Exception:
+                        contexts[kw] = None
+                    if on_resolved is not None:
+                        on_resolved(kw, contexts[kw])
+            except concurrent.futures.TimeoutError:
+                deadline.degrade(stage)
+                for future, kw in futures.items():
+                    if kw not in contexts:
+                        future.cancel()
+                        contexts[kw] = None
+                        if on_resolved is not None:
+                            on_resolved(kw, None)
+        finally:
+            # Don't wait on lookups nobody will read
+            executor.shutdown(wait=False, cancel_futures=True)
+        return contexts
+
+    def assign_weights(self, lines, on_line=None, reserve=0.0):
+        """Assign confidence weights to each line.
+
+        Keywords are gathered for the whole document and resolved once each, then
+        every line is scored locally against the shared contexts. If given,
+        on_line(index, line, confidence) fires as soon as each line's keywords are
+        all resolved, so callers can stream results before the slowest lookup ends.
+        reserve is how much of the request deadline to leave for later stages.
+        """
+        lines = [Document.of(line) for line in lines]
+        line_keywords = [self.dejargonifier.extract_keywords(line) for line in lines]
+        results = [None] * len(lines)
+        contexts = {}
+        waiting = [set(keywords) for keywords in line_keywords]
+        lines_by_keyword = {}
+        for i, keywords in enumerate(line_keywords):
+            for kw in keywords:
+                lines_by_keyword.setdefault(kw, []).append(i)
+
+        def finish(i):
+            results[i] = self._score_line(lines[i], line_keywords[i], contexts)
+            if on_line is not None:
+                on_line(i, *results[i])
+
+        def resolved(kw, context):
+            contexts[kw] = context
+            for i in lines_by_keyword.get(kw, []):
+                waiting[i].discard(kw)
+                if not waiting[i]:
+                    finish(i)
+
+        for i in range(len(lines)):
+            if not waiting[i]:
+                finish(i)
+        self.resolve_contexts(lines_by_keyword, on_resolved=resolved, reserve=reserve)
         return results
 
 def simplify_text(text):
-    """Replace complex words in text with simpler synonyms using TextBlob, and split into very short sentences."""
-    import nltk
-    nltk.download('punkt', quiet=True)
+    """Replace complex words in text with simpler synonyms from the simplification lexicon, and split into very short sentences."""
+    ensure_nltk_data()
     from nltk.tokenize import sent_tokenize
-    simple_words = set([
-        'the', 'be', 'to', 'of', 'and', 'a', 'in', 'that', 'have', 'I', 'it', 'for', 'not', 'on', 'with', 'he', 'as', 'you', 'do', 'at',
-        'this', 'but', 'his', 'by', 'from', 'they', 'we', 'say', 'her', 'she', 'or', 'an', 'will', 'my', 'one', 'all', 'would', 'there', 'their',
-        'what', 'so', 'up', 'out', 'if', 'about', 'who', 'get', 'which', 'go', 'me', 'when', 'make', 'can', 'like', 'time', 'no', 'just', 'him', 'know', 'take', 'people', 'into', 'year', 'your', 'good', 'some', 'could', 'them', 'see', 'other', 'than', 'then', 'now', 'look', 'only', 'come', 'its', 'over', 'think', 'also', 'back', 'after', 'use', 'two', 'how', 'our', 'work', 'first', 'well', 'way', 'even', 'new', 'want', 'because', 'any', 'these', 'give', 'day', 'most', 'us'
-    ])
+    lexicon = get_simple_lexicon()
     sentences = sent_tokenize(text)
     simplified_sentences = []
     for sent in sentences:
@@ -55,19 +127,10 @@ def simplify_text(text):
         simplified = []
         for w in words:
             w_clean = ''.join(filter(str.isalpha, w)).lower()
-            if w_clean in simple_words or len(w_clean) <= 4:
+            if w_clean in SIMPLE_WORDS or len(w_clean) <= 4:
                 simplified.append(w)
             else:
-                blob_word = Word(w_clean)
-                syns = blob_word.synsets
-                if syns:
-                    lemma = syns[0].lemmas()[0].name().replace('_', ' ')
-                    if lemma in simple_words:
-                        simplified.append(lemma)
-                    else:
-                        simplified.append(w)
-                else:
-                    simplified.append(w)
+                simplified.append(lexicon.lookup(w_clean) or w)
         # Make each sentence very short (max 6 words)
         for i in range(0, len(simplified), 6):
             chunk = simplified[i:i+6]
@@ -0,0 +1,62 @@
+from functools import cached_property
+from line_separator import LineSeparator
+
+_separator = LineSeparator()
+
+class Document:
+    """A piece of text plus everything derived from it, each computed at most once.
+
+    Stages pass the same Document around instead of raw strings so that the
+    lowercased form, word sets, sentence splits, NLTK tokens and keywords are
+    shared rather than recomputed by every consumer.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self._memo = {}
+
+    @classmethod
+    def of(cls, text):
+        """Return text itself if it is already a Document, else wrap it."""
+        if isinstance(text, Document):
+            return text
+        return cls(text if isinstance(text, str) else str(text))
+
+    def __str__(self):
+        return self.text
+
+    def __len__(self):
+        return len(self.text)
+
+    @cached_property
+    def lower(self):
+        return self.text.lower()
+
+    @cached_property
+    def words(self):
+        """Whitespace-separated lowercase words, in order."""
+        return self.lower.split()
+
+    @cached_property
+    def word_set(self):
+        return frozenset(self.words)
+
+    @cached_property
+    def word_count(self):
+        return len(self.text.split())
+
+    @cached_property
+    def tokens(self):
+        """NLTK word tokens of the original-case text."""
+        from nltk.tokenize import word_tokenize
+        return word_tokenize(self.text)
+
+    def sentences(self, mode="lenient"):
+        """LineSeparator output for the given mode, memoized per mode."""
+        return self.memo(('sentences', mode), lambda: _separator.separate(self.text, mode=mode))
+
+    def memo(self, key, compute):
+        """Memoize compute() under key; used for values that need outside context, like keywords."""
+        if key not in self._memo:
+            self._memo[key] = compute()
+        return self._memo[key]
@@ -0,0 +1,154 @@
+from init_summarizer import SENTENCE_BREAK
+
+def split_sentences(text):
+    """Sentences of text with their punctuation kept; newlines also end a sentence."""
+    sentences = []
+    for line in text.split('\n'):
+        sentences.extend(s.strip() for s in SENTENCE_BREAK.split(line.strip()) if s.strip())
+    return sentences
+
+class ExtractiveSummarizer:
+    """Model-free summaries: rank sentences by TextRank (or TF-IDF centrality) and pick them with MMR.
+
+    Sentences become L2-normalized TF-IDF rows, so X @ X.T is their cosine
+    similarity as a sparse matrix. TextRank runs power iteration over that graph
+    (edges below similarity_threshold dropped); "tfidf" scores each sentence by
+    its similarity to the document centroid instead. Selection is maximal
+    marginal relevance: each pick maximizes
+    (1 - diversity) * score - diversity * (max similarity to sentences already picked),
+    so near-repeats of a chosen sentence lose out; anything more similar than
+    max_overlap to a picked sentence is dropped outright.
+    """
+
+    def __init__(self, method="textrank", diversity=0.3, similarity_threshold=0.1, damping=0.85, max_overlap=0.7):
+        if method not in ("textrank", "tfidf"):
+            raise ValueError(f"unknown extractive method {method!r}")
+        self.method = method
+        self.diversity = diversity
+        self.similarity_threshold = similarity_threshold
+        self.damping = damping
+        self.max_overlap = max_overlap
+
+    def _vectors(self, sentences):
+        # numpy, scipy and sklearn are imported on first use so `import main` stays fast
+        import numpy as np
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        vectorizer = TfidfVectorizer(stop_words="english", sublinear_tf=True, dtype=np.float32)
+        return vectorizer.fit_transform(sentences)
+
+    def _textrank(self, X, iterations=50, tol=1e-6):
+        import numpy as np
+        from scipy import sparse
+        n = X.shape[0]
+        S = (X @ X.T).tocsr()
+        S.setdiag(0)
+        S.data[S.data < self.similarity_threshold] = 0
+        S.eliminate_zeros()
+        out_weight = np.asarray(S.sum(axis=1)).ravel()
+        dangling = out_weight == 0
+        out_weight[dangling] = 1
+        # Row-stochastic transitions; iterate on the transpose so scores stay a column vector
+        transition = sparse.diags(1 / out_weight) @ S
+        transition_t = transition.T.tocsr()
+        scores = np.full(n, 1.0 / n)
+        for _ in range(iterations):
+            # Sentences without edges spread their score evenly
+            leaked = scores[dangling].sum() / n
+            updated = (1 - self.damping) / n + self.damping * (transition_t @ scores + leaked)
+            if np.abs(updated - scores).sum() < tol:
+                return updated
+            scores = updated
+        return scores
+
+    def _centrality(self, X):
+        import numpy as np
+        centroid = np.asarray(X.mean(axis=0)).ravel()
+        norm = np.linalg.norm(centroid)
+        if norm == 0:
+            return np.zeros(X.shape[0])
+        return X @ (centroid / norm)
+
+    def rank(self, sentences):
+        """(scores, tfidf matrix): relevance per sentence scaled to [0, 1], or (None, None) if no content words."""
+        try:
+            X = self._vectors(sentences)
+        except ValueError:
+            # Only stop words (or nothing) left after tokenizing
+            return None, None
+        scores = self._textrank(X) if self.method == "textrank" else self._centrality(X)
+        top = scores.max()
+        return (scores / top if top > 0 else scores), X
+
+    def select(self, sentences, top_n=3, max_words=None):
+        """Indexes of the chosen sentences, in document order.
+
+        Picks up to top_n sentences, or, with max_words, as many as fit in that many words.
+        """
+        n = len(sentences)
+        if n == 0:
+            return []
+        limit = n if max_words is not None else min(top_n, n)
+        scores, X = self.rank(sentences) if n > 1 else (None, None)
+        if scores is None:
+            # Nothing to compare: fall back to the longest sentences
+            order = sorted(range(n), key=lambda i: len(sentences[i].split()), reverse=True)
+            return sorted(self._take(order, sentences, limit, max_words))
+        import numpy as np
+        chosen = []
+        words = 0
+        redundancy = np.zeros(n)
+        available = np.ones(n, dtype=bool)
+        lengths = np.array([len(s.split()) for s in sentences])
+        while len(chosen) < limit and available.any():
+            mmr = (1 - self.diversity) * scores - self.diversity * redundancy
+            mmr[~available] = -np.inf
+            best = int(np.argmax(mmr))
+            available[best] = False
+            if max_words is not None and words + lengths[best] > max_words:
+                if chosen:
+                    # This one doesn't fit; a shorter one still might
+                    continue
+            chosen.append(best)
+            words += lengths[best]
+            if max_words is not None and words >= max_words:
+                break
+            similarity = (X @ X[best].T).toarray().ravel()
+            redundancy = np.maximum(redundancy, similarity)
+            available &= similarity <= self.max_overlap
+        return sorted(chosen)
+
+    @staticmethod
+    def _take(order, sentences, limit, max_words):
+        taken, words = [], 0
+        for i in order:
+            if len(taken) >= limit:
+                break
+            length = len(sentences[i].split())
+            if max_words is not None and taken and words + length > max_words:
+                continue
+            taken.append(i)
+            words += length
+        return taken
+
+    def summarize(self, text, top_n=3, max_words=None):
+        """Extractive summary of text (a string or a list of sentences) in document order."""
+        sentences = split_sentences(text) if isinstance(text, str) else list(text)
+        return ' '.join(sentences[i] for i in self.select(sentences, top_n=top_n, max_words=max_words))
+
+    def shrink(self, text, max_words):
+        """Keep only the most central, least redundant sentences of text, up to max_words.
+
+        Used to cut what reaches the abstractive model; text already within
+        max_words comes back unchanged.
+        """
+        if len(text.split()) <= max_words:
+            return text
+        return self.summarize(text, max_words=max_words)
+
+_extractive = None
+
+def get_extractive_summarizer():
+    global _extractive
+    if _extractive is None:
+        _extractive = ExtractiveSummarizer()
+    return _extractive
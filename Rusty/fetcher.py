@@ -0,0 +1,145 @@
+import os
+import threading
+import time
+import concurrent.futures
+import requests
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup
+from instrumentation import incr, submit
+from host_health import get_host_health
+
+COMMON_SITES = [
+    'https://simple.wikipedia.org/wiki/',
+    'https://en.wikipedia.org/wiki/',
+    'https://www.researchgate.net/search/publication?q=',
+    'https://ground.news/search?q=',
+    'https://www.nature.com/',
+    'https://www.science.org/journal/science',
+]
+
+DEFAULT_DEADLINE = float(os.environ.get('RUSTY_FETCH_DEADLINE', 8))
+
+class FetchIncomplete(Exception):
+    """No paragraph found, but some source never really answered; unlike a plain miss, not worth caching."""
+
+class FetchDeadlineExceeded(FetchIncomplete, TimeoutError):
+    """No source answered before the lookup deadline."""
+
+def make_session(pool_size=32):
+    """A requests Session with a keep-alive connection pool large enough for our fetch threads."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers['User-Agent'] = 'VeriDeJargon/1.0 (+https://github.com/AatreyuShau/VeriDeJargon)'
+    return session
+
+def source_url(base, keyword):
+    # Wiki article paths want underscores; search endpoints take the raw query
+    if base.endswith('/wiki/'):
+        return base + keyword.replace(' ', '_')
+    return base + keyword
+
+def first_paragraph(html, min_length=40):
+    p = BeautifulSoup(html, 'html.parser').find('p')
+    if p and len(p.text) > min_length:
+        return p.text.strip()
+    return None
+
+class SourceFetcher:
+    """Looks a keyword up across several sources at once and keeps the first usable paragraph.
+
+    The first source gets a head start of hedge_delay seconds; if it hasn't produced
+    an answer by then, every other source is queried concurrently. Whatever answers
+    first wins, the rest are cancelled, and the whole lookup never outlives deadline.
+    Requests go through the shared host health registry, so hosts with an open
+    circuit are skipped outright and slow-but-alive hosts get timeouts sized to
+    their recent latency rather than the flat timeout.
+    """
+
+    def __init__(self, sources=None, deadline=DEFAULT_DEADLINE, timeout=5, hedge_delay=0.25,
+                 max_workers=16, session=None, health=None):
+        self.sources = list(sources or COMMON_SITES)
+        self.deadline = deadline
+        self.timeout = timeout
+        self.hedge_delay = hedge_delay
+        self.session = session or make_session(pool_size=max_workers)
+        self.health = health or get_host_health()
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='fetch')
+
+    def _fetch_one(self, url, cancelled, deadline_at):
+        """The url's first paragraph, None if it has none, or an exception if the source couldn't say.
+
+        HostUnavailable (breaker open or host saturated), connection errors and
+        5xx/429 responses all raise, which finishes the future at once so the
+        hedge fans out without waiting.
+        """
+        if cancelled.is_set():
+            return None
+        timeout = min(self.timeout, max(0.05, deadline_at - time.monotonic()))
+        resp = self.health.get(url, session=self.session, timeout=timeout)
+        if resp.status_code >= 500 or resp.status_code == 429:
+            raise FetchIncomplete(f"{url} answered {resp.status_code}")
+        if resp.status_code != 200 or cancelled.is_set():
+            return None
+        return first_paragraph(resp.text)
+
+    def fetch_first(self, keyword):
+        """Return the first acceptable paragraph about keyword from any source, or None.
+
+        None means every source answered without one. Raises FetchDeadlineExceeded
+        if sources were still outstanding when the deadline passed, and
+        FetchIncomplete if any source was skipped or failed instead of answering.
+        """
+        deadline_at = time.monotonic() + self.deadline
+        cancelled = threading.Event()
+        urls = [source_url(base, keyword) for base in self.sources]
+        pending = {submit(self.executor, self._fetch_one, urls[0], cancelled, deadline_at)}
+        incr('network_fetches')
+        hedged = len(urls) == 1
+        failures = []
+        try:
+            while pending or not hedged:
+                remaining = deadline_at - time.monotonic()
+                if remaining <= 0:
+                    raise FetchDeadlineExceeded(f"no source answered for {keyword!r} within {self.deadline}s")
+                wait_for = remaining if hedged else min(remaining, self.hedge_delay)
+                done, pending = concurrent.futures.wait(
+                    pending, timeout=wait_for, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for future in done:
+                    try:
+                        text = future.result()
+                    except Exception as e:
+                        failures.append(e)
+                        text = None
+                    if text:
+                        return text
+                # Primary source was slow or came back empty: fan out to the rest
+                if not hedged:
+                    pending |= {submit(self.executor, self._fetch_one, url, cancelled, deadline_at) for url in urls[1:]}
+                    incr('network_fetches', len(urls) - 1)
+                    hedged = True
+            if failures:
+                raise FetchIncomplete(f"{len(failures)} of {len(urls)} sources failed for {keyword!r}: {failures[0]}")
+            return None
+        finally:
+            cancelled.set()
+            for future in pending:
+                future.cancel()
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
+
+_fetcher = None
+_fetcher_lock = threading.Lock()
+
+def get_fetcher():
+    """Process-wide SourceFetcher sharing one connection pool."""
+    global _fetcher
+    if _fetcher is None:
+        with _fetcher_lock:
+            if _fetcher is None:
+                _fetcher = SourceFetcher()
+    return _fetcher
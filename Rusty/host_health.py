@@ -0,0 +1,195 @@
+import threading
+import time
+from collections import deque
+from urllib.parse import urlsplit
+from instrumentation import incr
+
+class HostUnavailable(Exception):
+    """The host's circuit is open, or it already has as many requests in flight as allowed."""
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a non-empty list of numbers."""
+    ordered = sorted(samples)
+    rank = max(1, int(round(pct / 100.0 * len(ordered) + 0.5)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+class HostHealth:
+    """Recent latency and outcomes for one host, with a circuit breaker and a concurrency cap.
+
+    The breaker opens when at least failure_rate of the last window requests
+    (and at least min_requests of them) failed. While open, requests are refused
+    at once; after cooldown seconds a single probe is let through, and its
+    outcome closes the breaker or re-opens it. The per-request timeout follows
+    the host's recent p95 latency times timeout_factor, clamped to
+    [min_timeout, max_timeout], so a host that normally answers in 200 ms isn't
+    waited on for 5 s.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+    def __init__(self, host, window=50, min_requests=5, failure_rate=0.5, cooldown=30.0,
+                 max_in_flight=4, queue_timeout=0.25, min_timeout=0.5, max_timeout=5.0,
+                 timeout_factor=2.0, latency_percentile=95):
+        self.host = host
+        self.min_requests = min_requests
+        self.failure_rate = failure_rate
+        self.cooldown = cooldown
+        self.max_in_flight = max_in_flight
+        self.queue_timeout = queue_timeout
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.timeout_factor = timeout_factor
+        self.latency_percentile = latency_percentile
+        self.latencies = deque(maxlen=window)
+        self.outcomes = deque(maxlen=window)
+        self.state = self.CLOSED
+        self.opened_at = 0.0
+        self.in_flight = 0
+        self._probing = False
+        self._cond = threading.Condition()
+        self.stats = {'requests': 0, 'failures': 0, 'rejected': 0, 'trips': 0}
+
+    def timeout(self):
+        with self._cond:
+            if len(self.latencies) < self.min_requests:
+                return self.max_timeout
+            estimate = percentile(self.latencies, self.latency_percentile) * self.timeout_factor
+        return min(self.max_timeout, max(self.min_timeout, estimate))
+
+    def acquire(self):
+        """Claim an in-flight slot, or raise HostUnavailable. Returns True if this request is the half-open probe."""
+        with self._cond:
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.cooldown:
+                    self._reject()
+                self.state = self.HALF_OPEN
+            if self.state == self.HALF_OPEN:
+                if self._probing:
+                    self._reject()
+                self._probing = True
+                self.in_flight += 1
+                return True
+            deadline = time.monotonic() + self.queue_timeout
+            while self.in_flight >= self.max_in_flight:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._reject()
+                self._cond.wait(remaining)
+            self.in_flight += 1
+            return False
+
+    def _reject(self):
+        self.stats['rejected'] += 1
+        incr('host_requests_rejected')
+        raise HostUnavailable(f'{self.host} is {"unavailable" if self.state != self.CLOSED else "saturated"}')
+
+    def release(self, ok, latency=None, probe=False):
+        """Free the slot and record the outcome; ok=None records nothing (e.g. the caller gave up first)."""
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify()
+            if probe:
+                self._probing = False
+            if ok is None:
+                if probe:
+                    # No verdict from the probe: let the next request try
+                    self.state = self.OPEN
+                    self.opened_at = time.monotonic() - self.cooldown
+                return
+            self.stats['requests'] += 1
+            self.outcomes.append(ok)
+            if ok and latency is not None:
+                self.latencies.append(latency)
+            if not ok:
+                self.stats['failures'] += 1
+            if probe:
+                if ok:
+                    self.state = self.CLOSED
+                    self.outcomes.clear()
+                else:
+                    self._trip()
+            elif self.state == self.CLOSED and len(self.outcomes) >= self.min_requests:
+                if self.outcomes.count(False) / len(self.outcomes) >= self.failure_rate:
+                    self._trip()
+
+    def _trip(self):
+        self.state = self.OPEN
+        self.opened_at = time.monotonic()
+        # The probe gets the full max_timeout, in case the host is now just slower than it was
+        self.latencies.clear()
+        self.stats['trips'] += 1
+        incr('circuit_breaker_trips')
+
+    def snapshot(self):
+        timeout = self.timeout()
+        with self._cond:
+            outcomes = list(self.outcomes)
+            latencies = list(self.latencies)
+            return {
+                **self.stats,
+                'state': self.state,
+                'in_flight': self.in_flight,
+                'error_rate': round(outcomes.count(False) / len(outcomes), 3) if outcomes else 0.0,
+                'p50': round(percentile(latencies, 50), 4) if latencies else None,
+                'p95': round(percentile(latencies, 95), 4) if latencies else None,
+                'timeout': round(timeout, 3),
+            }
+
+class HostHealthRegistry:
+    """One HostHealth per host, shared by every fetcher in the process."""
+
+    def __init__(self, **options):
+        self.options = options
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def for_url(self, url):
+        host = urlsplit(url).netloc.lower()
+        health = self._hosts.get(host)
+        if health is None:
+            with self._lock:
+                health = self._hosts.setdefault(host, HostHealth(host, **self.options))
+        return health
+
+    def get(self, url, session=None, timeout=None, **kwargs):
+        """GET url through its host's breaker and concurrency cap, with the host's adaptive timeout.
+
+        timeout, if given, is an upper bound (e.g. what's left of the caller's
+        deadline). Raises HostUnavailable without touching the network when the
+        host is tripped or saturated. 5xx and 429 responses count as failures.
+        """
+        import requests
+        health = self.for_url(url)
+        host_timeout = health.timeout()
+        effective = host_timeout if timeout is None else min(timeout, host_timeout)
+        probe = health.acquire()
+        start = time.monotonic()
+        try:
+            resp = (session or requests).get(url, timeout=effective, **kwargs)
+        except requests.Timeout:
+            # Cut short by the caller's own deadline says nothing about the host
+            health.release(False if effective >= host_timeout else None, probe=probe)
+            raise
+        except Exception:
+            health.release(False, probe=probe)
+            raise
+        ok = resp.status_code < 500 and resp.status_code != 429
+        health.release(ok, time.monotonic() - start, probe=probe)
+        return resp
+
+    def snapshot(self):
+        with self._lock:
+            hosts = dict(self._hosts)
+        return {host: health.snapshot() for host, health in sorted(hosts.items())}
+
+_registry = None
+_registry_lock = threading.Lock()
+
+def get_host_health():
+    """Process-wide host health registry."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = HostHealthRegistry()
+    return _registry
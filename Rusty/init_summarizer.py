@@ -1,32 +1,256 @@
-from transformers import pipeline
+import os
 import re
+import threading
+from bisect import bisect_right
+from phrase_matcher import CLAIM_MATCHER
+from instrumentation import incr, span
 
-fast_summarizer = pipeline("summarization", model="t5-small")
+SUMMARY_MODEL = os.environ.get('RUSTY_SUMMARY_MODEL', 't5-small')
+# torch (fp32), int8 (dynamically quantized torch) or onnx (ONNX Runtime via optimum)
+SUMMARY_BACKEND = os.environ.get('RUSTY_SUMMARIZER_BACKEND', 'torch')
+# Where the onnx backend keeps its exported graph; unset re-exports on every start
+ONNX_EXPORT_DIR = os.environ.get('RUSTY_ONNX_DIR')
+BACKENDS = ('torch', 'int8', 'onnx')
 
-def compress_sentences(text, fast=True, max_length=20, min_length=5):
-    sentences = re.split(r'(?<=[.?!])\s+', text.strip())
-    key_sents = []
+# Loaded on first use (or by warmup), so importing this module stays cheap
+_fast_summarizer = None
+_model_lock = threading.Lock()
+
+class GreedySummarizer:
+    """Wraps a summarization pipeline so every call decodes greedily with the KV cache on.
+
+    t5-small's config asks for 4-beam search; the CPU backends trade that for a
+    single beam, which is where most of their speedup over fp32 comes from.
+    """
+
+    def __init__(self, pipe):
+        self.pipe = pipe
+        self.tokenizer = pipe.tokenizer
+
+    def __call__(self, texts, **kwargs):
+        kwargs.setdefault('num_beams', 1)
+        kwargs.setdefault('use_cache', True)
+        return self.pipe(texts, **kwargs)
+
+def load_summarizer(backend=None, model=None):
+    """Build a summarization pipeline for backend; every backend has the pipeline call interface."""
+    backend = backend or SUMMARY_BACKEND
+    model = model or SUMMARY_MODEL
+    from transformers import AutoTokenizer, pipeline
+    if backend == 'torch':
+        return pipeline("summarization", model=model)
+    tokenizer = AutoTokenizer.from_pretrained(model)
+    if backend == 'int8':
+        import torch
+        from transformers import AutoModelForSeq2SeqLM
+        fp32 = AutoModelForSeq2SeqLM.from_pretrained(model)
+        fp32.eval()
+        quantized = torch.quantization.quantize_dynamic(fp32, {torch.nn.Linear}, dtype=torch.qint8)
+        return GreedySummarizer(pipeline("summarization", model=quantized, tokenizer=tokenizer))
+    if backend == 'onnx':
+        from optimum.onnxruntime import ORTModelForSeq2SeqLM
+        if ONNX_EXPORT_DIR and os.path.isdir(ONNX_EXPORT_DIR):
+            ort_model = ORTModelForSeq2SeqLM.from_pretrained(ONNX_EXPORT_DIR, use_cache=True)
+        else:
+            ort_model = ORTModelForSeq2SeqLM.from_pretrained(model, export=True, use_cache=True)
+            if ONNX_EXPORT_DIR:
+                ort_model.save_pretrained(ONNX_EXPORT_DIR)
+        return GreedySummarizer(pipeline("summarization", model=ort_model, tokenizer=tokenizer))
+    raise ValueError(f"unknown summarizer backend {backend!r}; expected one of {', '.join(BACKENDS)}")
+
+def get_fast_summarizer():
+    """Return the shared summarization pipeline for SUMMARY_BACKEND, loading it on first call."""
+    global _fast_summarizer
+    if _fast_summarizer is None:
+        with _model_lock:
+            if _fast_summarizer is None:
+                _fast_summarizer = load_summarizer()
+    return _fast_summarizer
 
-    for sent in sentences:
-        sent_lower = sent.lower()
-        if any(word in sent_lower for word in [
-            "says", "claims", "study", "suggests", "warns", "proves", "shows", "disproves", "alleges", "confirms", "allegedly", "reported", "reportedly", "research", "researchers", "scientists", "states", "experts", "'", "findings", "evidence", "evidently", "concludes", "conclusion", "concluded", "concludes that", "concluded that", '"', "according to", "according to experts", "according to researchers", "according to scientists", "according to the study", "according to the research"
-        ]):
-            key_sents.append(sent.strip())
+def is_model_loaded():
+    return _fast_summarizer is not None
+
+def __getattr__(name):
+    # Keep `init_summarizer.fast_summarizer` working for existing callers
+    if name == 'fast_summarizer':
+        return get_fast_summarizer()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+DEFAULT_BATCH_SIZE = int(os.environ.get('RUSTY_SUMMARY_BATCH_SIZE', 16))
+# t5-small reads 512 tokens; leave room for the "summarize: " prefix and special tokens
+CHUNK_TOKENS = 480
+CHUNK_OVERLAP = 48
+
+SENTENCE_BREAK = re.compile(r'(?<=[.?!])\s+')
+
+def compress_sentences(text, fast=True, max_length=20, min_length=5):
+    text_stripped = text.strip()
+    sentences = SENTENCE_BREAK.split(text_stripped)
+    # Scan the whole text once for claim phrases, then map each hit back to its sentence
+    starts = [0] + [m.end() for m in SENTENCE_BREAK.finditer(text_stripped)]
+    flagged = sorted({bisect_right(starts, start) - 1 for start, _, _, _ in CLAIM_MATCHER.finditer(text_stripped)})
+    key_sents = [sentences[i].strip() for i in flagged]
 
     if not key_sents:
-        return fast_summarizer(text, max_length=max_length, min_length=min_length, do_sample=False)[0]['summary_text']
+        # Through Summarizer so this call is batched and served like every other one
+        return Summarizer().summarize(text, fast=True, max_length=max_length, min_length=min_length)
     return " ".join(key_sents)
 
+def token_length(text, truncation=True):
+    """Model input length of text; pass truncation=False to count past the model window."""
+    try:
+        return len(get_fast_summarizer().tokenizer(text, truncation=truncation)['input_ids'])
+    except Exception:
+        return len(text.split())
+
+def chunk_by_tokens(text, budget=CHUNK_TOKENS, overlap=CHUNK_OVERLAP):
+    """Split text into sentence-aligned chunks of at most about budget tokens.
+
+    Each chunk repeats up to overlap tokens of trailing sentences from the one
+    before it, so statements that straddle a boundary keep their context.
+    """
+    pieces = []
+    for sent in SENTENCE_BREAK.split(text.strip()):
+        if not sent.strip():
+            continue
+        n = token_length(sent, truncation=False)
+        if n <= budget:
+            pieces.append((sent, n))
+            continue
+        # A single sentence longer than the window: cut it into word runs that fit
+        words = sent.split()
+        step = max(1, len(words) * budget // n)
+        for i in range(0, len(words), step):
+            part = ' '.join(words[i:i + step])
+            pieces.append((part, token_length(part, truncation=False)))
+    chunks = []
+    current, current_len = [], 0
+    for sent, n in pieces:
+        if current and current_len + n > budget:
+            chunks.append(' '.join(s for s, _ in current))
+            carry, carried = [], 0
+            for s, m in reversed(current):
+                if carried + m > overlap or carried + m + n > budget:
+                    break
+                carry.insert(0, (s, m))
+                carried += m
+            current, current_len = carry, carried
+        current.append((sent, n))
+        current_len += n
+    if current:
+        chunks.append(' '.join(s for s, _ in current))
+    return chunks
+
+# Set by enable_batching(); when present, fast summarize calls from every thread share batches
+_scheduler = None
+
+def enable_batching(window_ms=None, max_batch=None, run_batch=None, max_inflight=1):
+    """Route Summarizer calls through a process-wide micro-batching scheduler.
+
+    run_batch(texts, max_length, min_length) defaults to running the batch in this
+    process; serving.start_model_workers passes one that ships it to a worker.
+    """
+    global _scheduler
+    from batch_scheduler import BatchScheduler
+    if window_ms is None:
+        window_ms = float(os.environ.get('RUSTY_BATCH_WINDOW_MS', 5))
+    if max_batch is None:
+        max_batch = DEFAULT_BATCH_SIZE
+    if run_batch is None:
+        run_batch = Summarizer()._summarize_batches
+    if _scheduler is None:
+        _scheduler = BatchScheduler(run_batch, window_ms=window_ms, max_batch=max_batch, max_inflight=max_inflight)
+    return _scheduler
+
+def batching_stats():
+    return dict(_scheduler.stats) if _scheduler is not None else None
+
+def disable_batching():
+    global _scheduler
+    if _scheduler is not None:
+        _scheduler.close()
+        _scheduler = None
+
 class Summarizer:
     def summarize(self, text, fast=True, max_length=40, min_length=10):
         """Summarize the input text using the T5 model, or fallback to truncation if model fails."""
+        if fast:
+            incr('model_calls')
+        if fast and _scheduler is not None:
+            try:
+                return _scheduler.summarize(text, max_length=max_length, min_length=min_length)
+            except Exception:
+                return self.truncate(text, max_length)
+        return self._summarize_one(text, fast=fast, max_length=max_length, min_length=min_length)
+
+    def _summarize_one(self, text, fast=True, max_length=40, min_length=10):
         try:
             if fast:
-                return fast_summarizer(text, max_length=max_length, min_length=min_length, do_sample=False)[0]['summary_text']
+                return get_fast_summarizer()(text, max_length=max_length, min_length=min_length, do_sample=False)[0]['summary_text']
         except Exception:
             pass
-        # Fallback: truncate to max_length words
+        return self.truncate(text, max_length)
+
+    def summarize_many(self, texts, fast=True, max_length=40, min_length=10, batch_size=DEFAULT_BATCH_SIZE):
+        """Summarize a list of texts in batches, returning summaries in input order."""
+        texts = list(texts)
+        if not fast:
+            return [self.truncate(text, max_length) for text in texts]
+        incr('model_calls', len(texts))
+        if _scheduler is not None:
+            futures = [_scheduler.submit(text, max_length=max_length, min_length=min_length) for text in texts]
+            results = []
+            for text, future in zip(texts, futures):
+                try:
+                    results.append(future.result())
+                except Exception:
+                    results.append(self.truncate(text, max_length))
+            return results
+        return self._summarize_batches(texts, max_length=max_length, min_length=min_length, batch_size=batch_size)
+
+    def _summarize_batches(self, texts, max_length=40, min_length=10, batch_size=DEFAULT_BATCH_SIZE):
+        # Sort by token length so each batch pads to roughly the same size
+        order = sorted(range(len(texts)), key=lambda i: token_length(texts[i]))
+        results = [None] * len(texts)
+        for start in range(0, len(order), batch_size):
+            batch = order[start:start + batch_size]
+            try:
+                outputs = get_fast_summarizer()(
+                    [texts[i] for i in batch], max_length=max_length, min_length=min_length,
+                    do_sample=False, truncation=True, batch_size=len(batch)
+                )
+                for i, out in zip(batch, outputs):
+                    # Pipelines may wrap each item's output in its own list
+                    if isinstance(out, list):
+                        out = out[0]
+                    results[i] = out['summary_text']
+            except Exception:
+                # One bad input shouldn't lose the whole batch: retry item by item
+                for i in batch:
+                    results[i] = self._summarize_one(texts[i], max_length=max_length, min_length=min_length)
+        return results
+
+    def summarize_long(self, text, max_length=60, min_length=15, budget=CHUNK_TOKENS, overlap=CHUNK_OVERLAP):
+        """Summarize text of any length by map-reduce instead of letting the model truncate it.
+
+        The text is cut into overlapping chunks that fit the model window, all
+        chunks are summarized together in batches (map), and the joined partial
+        summaries are summarized again, recursively, until they fit (reduce).
+        """
+        length = token_length(text, truncation=False)
+        if length <= budget:
+            return self.summarize(text, fast=True, max_length=max_length, min_length=min_length)
+        with span("map_summarization"):
+            chunks = chunk_by_tokens(text, budget=budget, overlap=overlap)
+            partials = self.summarize_many(chunks, max_length=max_length, min_length=min(min_length, max_length))
+        reduced = ' '.join(partials)
+        if token_length(reduced, truncation=False) >= length:
+            # The map step didn't shrink anything (e.g. the model is unavailable); stop recursing
+            return self.truncate(reduced, max_length)
+        return self.summarize_long(reduced, max_length=max_length, min_length=min_length, budget=budget, overlap=overlap)
+
+    def truncate(self, text, max_length):
+        """Fallback: truncate to max_length words."""
         words = text.split()
         if len(words) > max_length:
             return ' '.join(words[:max_length]) + '...'
@@ -0,0 +1,110 @@
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from profiling import current_profile
+
+class Recorder:
+    """Stage timings (seconds) and event counters for one scope, usually one request."""
+
+    def __init__(self):
+        self.timings = {}
+        self.counters = {}
+        self._lock = threading.Lock()
+
+    def add_time(self, name, seconds):
+        with self._lock:
+            self.timings[name] = self.timings.get(name, 0.0) + seconds
+
+    def incr(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "timings": {k: round(v, 4) for k, v in self.timings.items()},
+                "counters": dict(self.counters),
+            }
+
+class Metrics:
+    """Process-wide totals behind the /metrics endpoint."""
+
+    def __init__(self):
+        self.spans = {}
+        self.counters = {}
+        self._lock = threading.Lock()
+
+    def add_time(self, name, seconds):
+        with self._lock:
+            stats = self.spans.setdefault(name, {"count": 0, "total": 0.0, "max": 0.0})
+            stats["count"] += 1
+            stats["total"] += seconds
+            stats["max"] = max(stats["max"], seconds)
+
+    def incr(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def snapshot(self):
+        with self._lock:
+            spans = {
+                name: {
+                    "count": s["count"],
+                    "total": round(s["total"], 4),
+                    "mean": round(s["total"] / s["count"], 4),
+                    "max": round(s["max"], 4),
+                }
+                for name, s in self.spans.items()
+            }
+            return {"spans": spans, "counters": dict(self.counters)}
+
+METRICS = Metrics()
+
+_current = contextvars.ContextVar('rusty_recorder', default=None)
+
+def current_recorder():
+    return _current.get()
+
+@contextmanager
+def recording():
+    """Collect spans and counters for the enclosed work; reuses an enclosing recorder if any."""
+    recorder = _current.get()
+    if recorder is not None:
+        yield recorder
+        return
+    recorder = Recorder()
+    token = _current.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _current.reset(token)
+
+@contextmanager
+def span(name):
+    """Time the enclosed block under name, in the current recorder and the global metrics."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        METRICS.add_time(name, elapsed)
+        recorder = _current.get()
+        if recorder is not None:
+            recorder.add_time(name, elapsed)
+
+def incr(name, n=1):
+    METRICS.incr(name, n)
+    recorder = _current.get()
+    if recorder is not None:
+        recorder.incr(name, n)
+
+def submit(executor, fn, *args, **kwargs):
+    """executor.submit that carries the caller's recorder into the worker thread.
+
+    Under an active profile the worker thread is also sampled while it runs fn.
+    """
+    profile = current_profile()
+    if profile is not None:
+        fn = profile.wrap(fn)
+    return executor.submit(contextvars.copy_context().run, fn, *args, **kwargs)
@@ -1,63 +1,87 @@
 import re
-import requests
-from bs4 import BeautifulSoup
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
+import threading
 from collections import Counter
+from context_cache import get_shared_cache
+from fetcher import COMMON_SITES, FetchIncomplete, get_fetcher
+from local_index import LIVE_FETCH, get_local_index
+from instrumentation import incr
+from document import Document
 
-nltk.download('punkt', quiet=True)
-nltk.download('stopwords', quiet=True)
+NLTK_RESOURCES = {
+    'punkt': 'tokenizers/punkt',
+    'punkt_tab': 'tokenizers/punkt_tab',
+    'stopwords': 'corpora/stopwords',
+}
 
-COMMON_SITES = [
-    'https://simple.wikipedia.org/wiki/',
-    'https://en.wikipedia.org/wiki/',
-    'https://www.researchgate.net/search/publication?q=',
-    'https://ground.news/search?q=',
-    'https://www.nature.com/',
-    'https://www.science.org/journal/science',
-]
+_nltk_ready = False
+_nltk_lock = threading.Lock()
+_stop_words = None
+
+def ensure_nltk_data():
+    """Make sure the NLTK data we use is present, downloading only what is missing."""
+    global _nltk_ready
+    if _nltk_ready:
+        return
+    with _nltk_lock:
+        if _nltk_ready:
+            return
+        import nltk
+        for name, path in NLTK_RESOURCES.items():
+            try:
+                nltk.data.find(path)
+            except LookupError:
+                nltk.download(name, quiet=True)
+        _nltk_ready = True
+
+def get_stop_words():
+    global _stop_words
+    if _stop_words is None:
+        ensure_nltk_data()
+        from nltk.corpus import stopwords
+        _stop_words = set(stopwords.words('english'))
+    return _stop_words
 
 class KeywordDejargonifier:
-    def __init__(self):
-        self.stop_words = set(stopwords.words('english'))
+    def __init__(self, cache=None, fetcher=None, local_index=None, live=LIVE_FETCH):
+        self.stop_words = get_stop_words()
+        self.cache = cache if cache is not None else get_shared_cache()
+        self.fetcher = fetcher or get_fetcher()
+        # Offline abstracts index (RUSTY_LOCAL_INDEX), consulted before any network source
+        self.local_index = local_index if local_index is not None else get_local_index()
+        self.live = live
 
     def is_jargon(self, word):
         # Heuristic: not a stopword, not a common English word, not punctuation, not a number
         return word.isalpha() and word.lower() not in self.stop_words and len(word) > 3
 
     def extract_keywords(self, text):
-        words = word_tokenize(text)
-        words = [w for w in words if self.is_jargon(w)]
+        """Top keywords of text (a str or Document); memoized on the Document."""
+        doc = Document.of(text)
+        return list(doc.memo('keywords', lambda: self._extract_keywords(doc)))
+
+    def _extract_keywords(self, doc):
+        words = [w for w in doc.tokens if self.is_jargon(w)]
         freq = Counter(words)
         # Return most common nontrivial words
         return [w for w, _ in freq.most_common(10)]
 
     def fetch_context(self, keyword):
-        # Try Wikipedia first
-        url = COMMON_SITES[0] + keyword.replace(' ', '_')
+        if self.local_index is not None:
+            context = self.local_index.lookup(keyword)
+            if context:
+                incr("local_index_hits")
+                return context
+        if not self.live:
+            return None
         try:
-            resp = requests.get(url, timeout=5)
-            if resp.status_code == 200:
-                soup = BeautifulSoup(resp.text, 'html.parser')
-                p = soup.find('p')
-                if p and len(p.text) > 40:
-                    return p.text.strip()
-        except Exception:
-            pass
-        # Try other sources
-        for base in COMMON_SITES[1:]:
-            try:
-                resp = requests.get(base + keyword, timeout=5)
-                if resp.status_code == 200:
-                    soup = BeautifulSoup(resp.text, 'html.parser')
-                    # Try to find a summary/description
-                    p = soup.find('p')
-                    if p and len(p.text) > 40:
-                        return p.text.strip()
-            except Exception:
-                continue
-        return None
+            return self.cache.get_or_fetch(keyword, self._fetch_context_live)
+        except FetchIncomplete:
+            # Sources were slow, down or saturated; leave it uncached so the next lookup tries again
+            return None
+
+    def _fetch_context_live(self, keyword):
+        # Wikipedia gets a head start, then the other COMMON_SITES are raced against it
+        return self.fetcher.fetch_first(keyword)
 
     def dejargonify(self, text):
         keywords = self.extract_keywords(text)
@@ -79,3 +103,12 @@ class KeywordDejargonifier:
             if context:
                 contexts[kw] = context
         return contexts
+
+_shared_dejargonifier = None
+
+def get_dejargonifier():
+    """Process-wide KeywordDejargonifier; it holds no per-request state."""
+    global _shared_dejargonifier
+    if _shared_dejargonifier is None:
+        _shared_dejargonifier = KeywordDejargonifier()
+    return _shared_dejargonifier
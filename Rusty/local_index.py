@@ -0,0 +1,151 @@
+import bz2
+import gzip
+import json
+import os
+import sqlite3
+import sys
+import threading
+import xml.etree.ElementTree as ET
+
+LOCAL_INDEX_PATH = os.environ.get('RUSTY_LOCAL_INDEX', '')
+# Set RUSTY_LIVE_FETCH=0 to answer from the local index only, with no network fallback
+LIVE_FETCH = os.environ.get('RUSTY_LIVE_FETCH', '1') != '0'
+
+MIN_ABSTRACT_LENGTH = 40
+
+def normalize_key(title):
+    return ' '.join(title.replace('_', ' ').lower().split())
+
+def _open(path):
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rb')
+    if path.endswith('.bz2'):
+        return bz2.open(path, 'rb')
+    return open(path, 'rb')
+
+def iter_abstracts(path):
+    """Yield (title, abstract) pairs from a Wikipedia abstracts XML dump or a JSONL/TSV file.
+
+    XML is the enwiki-*-abstract.xml format (<doc><title>Wikipedia: X</title><abstract>...).
+    JSONL lines need "title" and "abstract" keys; TSV lines are title<TAB>abstract.
+    """
+    base = path[:-3] if path.endswith('.gz') else path[:-4] if path.endswith('.bz2') else path
+    with _open(path) as f:
+        if base.endswith('.xml'):
+            title = None
+            for _, el in ET.iterparse(f, events=('end',)):
+                if el.tag == 'title':
+                    title = (el.text or '').split(':', 1)[-1].strip()
+                elif el.tag == 'abstract':
+                    abstract = (el.text or '').strip()
+                    if title:
+                        yield title, abstract
+                elif el.tag == 'doc':
+                    title = None
+                    # Drop finished <doc> elements so memory stays flat on multi-GB dumps
+                    el.clear()
+        else:
+            for raw in f:
+                line = raw.decode('utf-8').rstrip('\n')
+                if not line.strip():
+                    continue
+                if base.endswith('.jsonl'):
+                    record = json.loads(line)
+                    yield record.get('title', ''), record.get('abstract', '')
+                else:
+                    title, _, abstract = line.partition('\t')
+                    yield title, abstract
+
+def build_index(dump_path, index_path, batch_size=10000):
+    """Build a compact SQLite lookup index from an abstracts dump. Returns the number of entries."""
+    if os.path.exists(index_path):
+        os.remove(index_path)
+    conn = sqlite3.connect(index_path)
+    conn.execute('PRAGMA journal_mode=OFF')
+    conn.execute('PRAGMA synchronous=OFF')
+    conn.execute('CREATE TABLE abstracts (id INTEGER PRIMARY KEY, key TEXT NOT NULL, title TEXT, abstract TEXT)')
+    count = 0
+    batch = []
+    for title, abstract in iter_abstracts(dump_path):
+        if len(abstract) <= MIN_ABSTRACT_LENGTH:
+            continue
+        batch.append((normalize_key(title), title, abstract))
+        if len(batch) >= batch_size:
+            conn.executemany('INSERT INTO abstracts (key, title, abstract) VALUES (?, ?, ?)', batch)
+            count += len(batch)
+            batch = []
+    if batch:
+        conn.executemany('INSERT INTO abstracts (key, title, abstract) VALUES (?, ?, ?)', batch)
+        count += len(batch)
+    # Index after loading: much faster than maintaining it row by row
+    conn.execute('CREATE INDEX abstracts_key ON abstracts (key)')
+    try:
+        conn.execute("CREATE VIRTUAL TABLE abstracts_fts USING fts5(title, content='abstracts', content_rowid='id')")
+        conn.execute("INSERT INTO abstracts_fts (abstracts_fts) VALUES ('rebuild')")
+    except sqlite3.OperationalError:
+        # SQLite built without FTS5: exact-title lookups still work
+        pass
+    conn.commit()
+    conn.execute('VACUUM')
+    conn.close()
+    return count
+
+class LocalKnowledgeIndex:
+    """Read-only keyword -> paragraph lookups against an index built by build_index."""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self.has_fts = self._connection().execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'abstracts_fts'"
+        ).fetchone() is not None
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(f'file:{self.path}?mode=ro', uri=True, check_same_thread=False)
+            conn.execute('PRAGMA mmap_size=268435456')
+            self._local.conn = conn
+        return conn
+
+    def lookup(self, keyword):
+        """Return the abstract whose title matches keyword, falling back to a full-text title match."""
+        conn = self._connection()
+        row = conn.execute(
+            'SELECT abstract FROM abstracts WHERE key = ? LIMIT 1', (normalize_key(keyword),)
+        ).fetchone()
+        if row is None and self.has_fts:
+            # Quote every term so user text can't be parsed as FTS query syntax
+            query = ' '.join('"' + term.replace('"', '""') + '"' for term in keyword.split())
+            if query:
+                try:
+                    row = conn.execute(
+                        'SELECT a.abstract FROM abstracts_fts f JOIN abstracts a ON a.id = f.rowid '
+                        'WHERE abstracts_fts MATCH ? ORDER BY f.rank LIMIT 1', (query,)
+                    ).fetchone()
+                except sqlite3.OperationalError:
+                    row = None
+        return row[0] if row else None
+
+_index = None
+_index_lock = threading.Lock()
+
+def get_local_index():
+    """The index configured by RUSTY_LOCAL_INDEX, or None when there isn't one."""
+    global _index
+    if _index is None and LOCAL_INDEX_PATH and os.path.exists(LOCAL_INDEX_PATH):
+        with _index_lock:
+            if _index is None:
+                _index = LocalKnowledgeIndex(LOCAL_INDEX_PATH)
+    return _index
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == 'build':
+        n = build_index(sys.argv[2], sys.argv[3])
+        print(f"Indexed {n} abstracts into {sys.argv[3]}", file=sys.stderr)
+    elif len(sys.argv) >= 4 and sys.argv[1] == 'lookup':
+        print(LocalKnowledgeIndex(sys.argv[2]).lookup(' '.join(sys.argv[3:])))
+    else:
+        print("usage: local_index.py build <dump.xml[.gz]|.jsonl|.tsv> <index.sqlite3>\n"
+              "       local_index.py lookup <index.sqlite3> <keyword>", file=sys.stderr)
+        sys.exit(1)
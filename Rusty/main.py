@@ -2,28 +2,129 @@ from content_formatter import ContentFormatter
 from content_culler import ContentCuller
 from line_separator import LineSeparator
 from debate_analyzer import DebateAnalyzer
-from init_summarizer import Summarizer
-from textblob import Word
+from init_summarizer import Summarizer, get_fast_summarizer, batching_stats, enable_batching
+from keyword_dejargonifier import get_dejargonifier, ensure_nltk_data
+import argparse
+import collections
 import sys
+import threading
 import traceback
-from time import sleep
 import json
+import queue
 import re
 import concurrent.futures
+from instrumentation import METRICS, recording, span, submit
+from phrase_matcher import HALLUCINATION_MATCHER, ATTRIBUTION_CLAUSE
+from document import Document
+from context_cache import get_shared_cache
+from serving import model_worker_stats
+from result_cache import get_result_cache
+from init_summarizer import SUMMARY_MODEL, SUMMARY_BACKEND
+from local_index import LOCAL_INDEX_PATH, LIVE_FETCH
+from extractive import get_extractive_summarizer
+from deadline import current_deadline, deadline_scope
+from host_health import get_host_health
+from stage_graph import Stage, StageGraph, StopGraph
+from profiling import profiling, current_profile
+from simple_lexicon import get_simple_lexicon
+
+# Anything that changes what a request returns; cached results from other settings are ignored
+RESULT_CONFIG = f"{SUMMARY_MODEL}|{SUMMARY_BACKEND}|{LOCAL_INDEX_PATH}|{LIVE_FETCH}"
+
+# "abstractive" runs the full T5 pipeline; "extractive" picks sentences with no model calls
+MODES = ("abstractive", "extractive")
+EXTRACTIVE_SENTENCES = 3
+# Extractive pre-filter budgets (words) for text headed to T5: about one model window for a
+# single summarize call, a few windows for map-reduce over long documents
+ABSTRACTIVE_INPUT_WORDS = 300
+LONG_INPUT_WORDS = 1200
+
+# Cold-start duration guesses (seconds) for deadline decisions, until spans have real numbers
+STAGE_ESTIMATES = {
+    "chunk_summarization": 1.5,
+    "weighting": 1.0,
+    "abstractive_summary": 0.5,
+    "context_fetch": 0.5,
+    "final_summary": 0.5,
+    "long_summary": 3.0,
+}
+# Budget weighting leaves for the summary stages after it
+SUMMARY_RESERVE = STAGE_ESTIMATES["abstractive_summary"] + STAGE_ESTIMATES["final_summary"]
+
+CITATION_RE = re.compile(r'\n\[Citations: (.*)\]$', re.DOTALL)
+
+class PipelineResult:
+    """Everything one Pipeline.run produced, kept in memory instead of written to the CWD."""
+
+    def __init__(self, weighted_lines=None, summary="", timings=None, counters=None):
+        self.weighted_lines = weighted_lines or []
+        self.summary = summary
+        # Seconds per stage and event counts (model calls, fetches, cache hits) for this run
+        self.timings = timings or {}
+        self.counters = counters or {}
+
+    @property
+    def citations(self):
+        """Map each weighted line (without its citation suffix) to its list of citations."""
+        citations = {}
+        for line, _ in self.weighted_lines:
+            match = CITATION_RE.search(line)
+            if match:
+                citations[line[:match.start()]] = match.group(1).split('; ')
+        return citations
+
+    def to_dict(self):
+        return {
+            "weighted_lines": [
+                {"line": line, "confidence": confidence}
+                for line, confidence in self.weighted_lines
+            ],
+            "citations": self.citations,
+            "summary": self.summary,
+            "timings": self.timings,
+            "counters": self.counters,
+        }
+
+class FileExportSink:
+    """Optional Pipeline sink that writes a result to the legacy output files."""
+
+    def __init__(self, weighted_path="output_weighted_lines.json", summary_path="output_final_summary.txt"):
+        self.weighted_path = weighted_path
+        self.summary_path = summary_path
+
+    def __call__(self, result):
+        export_weighted_lines(result.weighted_lines, self.weighted_path)
+        if result.summary:
+            with open(self.summary_path, "w") as f:
+                f.write(result.summary)
+
+def export_weighted_lines(weighted_lines, filename="output_weighted_lines.json"):
+    export_data = [
+        {"line": line, "confidence": confidence}
+        for line, confidence in weighted_lines
+    ]
+    with open(filename, "w") as f:
+        json.dump(export_data, f, indent=2)
 
 class Pipeline:
-    def __init__(self):
+    def __init__(self, sinks=None, progress=None):
         self.formatter = ContentFormatter()
         self.culler = ContentCuller()
         self.separator = LineSeparator()
         self.debater = DebateAnalyzer()
         self.summarizer = Summarizer()
+        # Callables that receive each PipelineResult, e.g. FileExportSink()
+        self.sinks = list(sinks or [])
+        # Optional progress(message) callback for stage announcements, e.g. print_progress on the CLI
+        self.progress = progress
+        self.graph = self._build_graph()
 
     def sentence_separation(self, text, mode="lenient"):
-        return self.separator.separate(text, mode=mode)
+        return Document.of(text).sentences(mode)
 
     def summarize_chunks(self, chunks, fast=True, max_length=40, min_length=10):
-        return [self.summarizer.summarize(chunk, fast=fast, max_length=max_length, min_length=min_length) for chunk in chunks if chunk.strip()]
+        chunks = [chunk for chunk in chunks if chunk.strip()]
+        return self.summarizer.summarize_many(chunks, fast=fast, max_length=max_length, min_length=min_length)
 
     def format_content(self, text):
         return self.formatter.format(text)
@@ -31,16 +132,11 @@ class Pipeline:
     def cull_content(self, text):
         return self.culler.cull(text)
 
-    def assign_weights(self, lines):
-        return self.debater.assign_weights(lines)
+    def assign_weights(self, lines, on_line=None, reserve=0.0):
+        return self.debater.assign_weights(lines, on_line=on_line, reserve=reserve)
 
     def export_weighted_lines(self, weighted_lines, filename="output_weighted_lines.json"):
-        export_data = [
-            {"line": line, "confidence": confidence}
-            for line, confidence in weighted_lines
-        ]
-        with open(filename, "w") as f:
-            json.dump(export_data, f, indent=2)
+        export_weighted_lines(weighted_lines, filename)
 
     def multi_layer_summarize(self, lines, layer1_max=40, layer1_min=10, layer2_max=25, layer2_min=8):
         joined = ' '.join(lines)
@@ -48,99 +144,210 @@ class Pipeline:
         layer2 = self.summarizer.summarize(layer1, fast=True, max_length=layer2_max, min_length=layer2_min)
         return layer2
 
-    def run(self, input_text):
-        print_progress("~ 1. Sentence Separation (lenient)")
-        first_chunks = self.sentence_separation(input_text, mode="lenient")
-        print_progress("~ 1. Summarization (on large chunks)")
-        summarized_chunks = self.summarize_chunks(first_chunks)
-        joined_summarized = ' '.join(summarized_chunks)
-        print_progress("~ 2. Cutting/Culling & Summarizing (more aggressive)")
-        formatted = self.format_content(joined_summarized)
-        culled = self.cull_content(formatted)
-        print_progress("~ 2. Sentence Separation (smaller bits)")
-        small_bits = self.sentence_separation(culled, mode="strict")
+    def run(self, input_text, on_line=None):
+        """Run every stage on input_text (a str or Document) and return a PipelineResult.
+
+        on_line(index, line, confidence) is called as each weighted line is ready.
+        """
+        result = PipelineResult()
+        with recording() as recorder, span("total"):
+            self._run(input_text, result, on_line)
+        result.timings = recorder.snapshot()["timings"]
+        result.counters = recorder.snapshot()["counters"]
+        for sink in self.sinks:
+            sink(result)
+        return result
+
+    def _progress(self, message):
+        if self.progress is not None:
+            self.progress(message)
+
+    def _run(self, input_text, result, on_line):
+        values = self.graph.run(input_text=input_text, on_line=on_line)
+        result.weighted_lines = values.get("weighted_lines", [])
+        if "final_summary" in values:
+            print("\n📝 Simplified Verified Summary:", file=sys.stderr)
+            print(values["final_summary"], file=sys.stderr)
+            result.summary = values["final_summary"]
+
+    def _build_graph(self):
+        """The stages of run() as a dependency graph.
+
+        Separation through weighting is a chain, but once the credible lines are
+        known the extractive pick, the T5 summary and the keyword lookups run side
+        by side, and the keyword contexts are fetched once for both the online
+        context and the technical-term explanations.
+        """
+        return StageGraph([
+            Stage("separation", self._separate_chunks, inputs=["input_text"], outputs=["first_chunks"]),
+            Stage("chunk_summarization", self._summarize_first_chunks, inputs=["first_chunks"], outputs=["summarized_chunks"]),
+            Stage("culling", self._cull, inputs=["summarized_chunks"], outputs=["small_bits"]),
+            Stage("weighting", self._weigh, inputs=["small_bits", "on_line"], outputs=["weighted_lines"]),
+            Stage("credible", self._credible, inputs=["weighted_lines"], outputs=["credible_lines", "merged_credible"]),
+            Stage("extractive_summary", self._extractive_summary, inputs=["credible_lines"]),
+            Stage("abstractive_summary", self._abstractive_summary, inputs=["credible_lines", "merged_credible"]),
+            Stage("keyword_contexts", self._keyword_contexts, inputs=["merged_credible"], outputs=["keyword_contexts", "context_error"]),
+            Stage("combined_summary", self._combined_summary,
+                  inputs=["extractive_summary", "abstractive_summary", "keyword_contexts", "context_error", "merged_credible"]),
+            Stage("final_summary", self._final_summary,
+                  inputs=["combined_summary", "extractive_summary", "abstractive_summary", "merged_credible"]),
+        ])
+
+    # Under a request budget each model or network stage first checks it still fits,
+    # falling back to a cheaper version (and saying so in deadline.degraded) if not
+
+    def _separate_chunks(self, input_text):
+        self._progress("~ 1. Sentence Separation (lenient)")
+        with span("separation"):
+            return self.sentence_separation(input_text, mode="lenient")
+
+    def _summarize_first_chunks(self, first_chunks):
+        deadline = current_deadline()
+        self._progress("~ 1. Summarization (on large chunks)")
+        if not deadline.allows("chunk_summarization", STAGE_ESTIMATES["chunk_summarization"],
+                               reserve=STAGE_ESTIMATES["weighting"] + SUMMARY_RESERVE):
+            deadline.degrade("chunk_summarization")
+            return first_chunks
+        with span("chunk_summarization"):
+            return self.summarize_chunks(first_chunks)
+
+    def _cull(self, summarized_chunks):
+        self._progress("~ 2. Cutting/Culling & Summarizing (more aggressive)")
+        with span("culling"):
+            formatted = self.format_content(' '.join(summarized_chunks))
+            culled = self.cull_content(formatted)
+        self._progress("~ 2. Sentence Separation (smaller bits)")
+        with span("separation"):
+            small_bits = self.sentence_separation(culled, mode="strict")
         if not small_bits:
             print("\n ! Warning: No clear statements found to analyze", file=sys.stderr)
-            return []  # Return empty list instead of None
-        print_progress(" ? Assigning weights (truth/confidence)")
-        weighted_lines = self.assign_weights(small_bits)
-        self.export_weighted_lines(weighted_lines)
+            raise StopGraph()
+        return small_bits
+
+    def _weigh(self, small_bits, on_line):
+        self._progress(" ? Assigning weights (truth/confidence)")
+        with span("weighting"):
+            weighted_lines = self.assign_weights(small_bits, on_line=on_line, reserve=SUMMARY_RESERVE)
+        return weighted_lines
+
+    def _credible(self, weighted_lines):
+        if current_deadline().expired():
+            # Whoever was waiting on this run has already answered without it
+            raise StopGraph()
         print("\n📊 Analysis Results:", file=sys.stderr)
         print("\n🎯 Most Credible Statements:", file=sys.stderr)
         # Merge all high and medium confidence lines for summary
         credible_lines = [line for line, confidence in weighted_lines if confidence >= 0.6]
         for line, confidence in weighted_lines:
             if confidence >= 0.8:
-                print(f"\n### HIGH CONF ({{confidence:.2f}}):")
-                print(f"   {{line}}")
+                print(f"\n### HIGH CONF ({confidence:.2f}):", file=sys.stderr)
+                print(f"   {line}", file=sys.stderr)
             elif confidence >= 0.6:
-                print(f"\n## MODERATE CONF ({{confidence:.2f}}):")
-                print(f"   {{line}}")
+                print(f"\n## MODERATE CONF ({confidence:.2f}):", file=sys.stderr)
+                print(f"   {line}", file=sys.stderr)
             else:
-                print(f"\n# LOW CONF ({{confidence:.2f}}):")
-                print(f"   {{line}}")
-        if credible_lines:
-            # Merge all credible lines
-            merged_credible = ' '.join(credible_lines)
-            # Extractive: select the top 1-2 most representative sentences
-            extractive_sents = self.select_representative_sentences(credible_lines, top_n=2)
-            extractive_summary = ' '.join(extractive_sents)
-            # Generative: pass merged credible lines through the summarizer
-            abstractive_summary = self.summarizer.summarize(merged_credible, fast=True, max_length=25, min_length=8)
-            # Add context from online resources for the whole summary
-            try:
-                from keyword_dejargonifier import KeywordDejargonifier
-                dejargonifier = KeywordDejargonifier()
-                # Get all keyword contexts for the merged credible lines
-                keyword_contexts = dejargonifier.get_contexts(merged_credible)
-                if keyword_contexts:
-                    online_context = '\n'.join([f"{k}: {v}" for k, v in keyword_contexts.items() if len(v.split()) > 5])
-                    combined_summary = extractive_summary + ' ' + abstractive_summary + "\n\nOnline Context:\n" + online_context
-                else:
-                    combined_summary = extractive_summary + ' ' + abstractive_summary
-            except Exception as e:
-                combined_summary = extractive_summary + ' ' + abstractive_summary + f"\n[Online context error: {e}]"
-            # Post-process to remove hallucinated phrases not in the original input
-            combined_summary = self.remove_hallucinations(combined_summary, merged_credible)
-            # Add de-jargonified context for technical terms (filtered, as before)
-            try:
-                explanations = dejargonifier.dejargonify(merged_credible)
-                filtered_explanations = {}
-                for term, expl in explanations.items():
-                    if term.lower() in merged_credible.lower() and term.lower() not in extractive_summary.lower():
-                        filtered_explanations[term] = expl
-                if filtered_explanations:
-                    combined_summary += "\n\nTechnical Terms Explained:\n"
-                    for term, expl in filtered_explanations.items():
-                        if term.lower() in merged_credible.lower() and len(expl.split()) > 5:
-                            combined_summary += f"- {term}: {expl}\n"
-            except Exception as e:
-                combined_summary += f"\n[Dejargonifier error: {e}]"
-            # Final pass: summarize everything (extractive + generative + online context + explanations)
+                print(f"\n# LOW CONF ({confidence:.2f}):", file=sys.stderr)
+                print(f"   {line}", file=sys.stderr)
+        if not credible_lines:
+            raise StopGraph()
+        # Merge all credible lines
+        return credible_lines, Document(' '.join(credible_lines))
+
+    def _extractive_summary(self, credible_lines):
+        # Extractive: select the top 1-2 most representative sentences
+        return ' '.join(self.select_representative_sentences(credible_lines, top_n=2))
+
+    def _abstractive_summary(self, credible_lines, merged_credible):
+        deadline = current_deadline()
+        # Generative: pass merged credible lines through the summarizer, pre-filtered to fit its window
+        if not deadline.allows("abstractive_summary", STAGE_ESTIMATES["abstractive_summary"],
+                               reserve=STAGE_ESTIMATES["final_summary"]):
+            deadline.degrade("abstractive_summary")
+            return get_extractive_summarizer().summarize(credible_lines, top_n=1)
+        with span("abstractive_summary"):
+            abstractive_input = get_extractive_summarizer().shrink(merged_credible.text, ABSTRACTIVE_INPUT_WORDS)
+            return self.summarizer.summarize(abstractive_input, fast=True, max_length=25, min_length=8)
+
+    def _keyword_contexts(self, merged_credible):
+        """Contexts for the credible text's keywords, fetched once (concurrently) for both online context and explanations."""
+        deadline = current_deadline()
+        if not deadline.allows("context_fetch", STAGE_ESTIMATES["context_fetch"], reserve=STAGE_ESTIMATES["final_summary"]):
+            deadline.degrade("online_context")
+            return {}, None
+        try:
+            with span("context_fetch"):
+                keywords = self.debater.dejargonifier.extract_keywords(merged_credible)
+                resolved = self.debater.resolve_contexts(keywords, reserve=STAGE_ESTIMATES["final_summary"],
+                                                         stage="online_context")
+            return {kw: resolved[kw] for kw in keywords if resolved.get(kw)}, None
+        except Exception as e:
+            return {}, str(e)
+
+    def _combined_summary(self, extractive_summary, abstractive_summary, keyword_contexts, context_error, merged_credible):
+        # Add context from online resources for the whole summary
+        if context_error is not None:
+            combined_summary = extractive_summary + ' ' + abstractive_summary + f"\n[Online context error: {context_error}]"
+        elif keyword_contexts:
+            online_context = '\n'.join([f"{k}: {v}" for k, v in keyword_contexts.items() if len(v.split()) > 5])
+            combined_summary = extractive_summary + ' ' + abstractive_summary + "\n\nOnline Context:\n" + online_context
+        else:
+            combined_summary = extractive_summary + ' ' + abstractive_summary
+        # Post-process to remove hallucinated phrases not in the original input
+        combined_summary = self.remove_hallucinations(combined_summary, merged_credible)
+        # Add de-jargonified context for technical terms (filtered, as before)
+        filtered_explanations = {}
+        for term, expl in keyword_contexts.items():
+            if term.lower() in merged_credible.lower and term.lower() not in extractive_summary.lower():
+                filtered_explanations[term] = expl
+        if filtered_explanations:
+            combined_summary += "\n\nTechnical Terms Explained:\n"
+            for term, expl in filtered_explanations.items():
+                if term.lower() in merged_credible.lower and len(expl.split()) > 5:
+                    combined_summary += f"- {term}: {expl}\n"
+        return combined_summary
+
+    def _final_summary(self, combined_summary, extractive_summary, abstractive_summary, merged_credible):
+        deadline = current_deadline()
+        # Final pass: summarize everything (extractive + generative + online context + explanations)
+        if not deadline.allows("final_summary", STAGE_ESTIMATES["final_summary"]):
+            deadline.degrade("final_summary")
+            return (extractive_summary + ' ' + abstractive_summary).strip()
+        with span("final_summary"):
             final_summary = self.summarizer.summarize(combined_summary, fast=True, max_length=30, min_length=10)
-            final_summary = self.remove_irrelevant_lines(final_summary, merged_credible)
-            print("\n📝 Simplified Verified Summary:", file=sys.stderr)
-            print(final_summary)
-            with open("output_final_summary.txt", "w") as f:
-                f.write(final_summary)
-        return weighted_lines
+            return self.remove_irrelevant_lines(final_summary, merged_credible)
 
     def select_representative_sentences(self, lines, top_n=2):
         """Select the most representative sentences (extractive)."""
-        # pick the longest and most information-dense lines
-        sorted_lines = sorted(lines, key=lambda l: len(l.split()), reverse=True)
-        return sorted_lines[:top_n]
+        # most central lines by TextRank, skipping near-repeats of lines already picked
+        return [lines[i] for i in get_extractive_summarizer().select(lines, top_n=top_n)]
 
     def remove_hallucinations(self, summary, source_text):
         """Remove common hallucinated phrases if not present in the source text."""
-        hallucinated_patterns = [
-            r"i'?m not a big fan[,.]?", r"says [A-Za-z]+", r"according to", r"warns", r"claims", r"study", r"experts?", r"scientists?", r"doctors?", r"alleges?", r"confirms?", r"allegedly", r"reported", r"reportedly", r"research", r"findings", r"evidence", r"concludes?", r"conclusion", r"concluded that", r"concludes that", r"according to [A-Za-z ]+", r"according to the study", r"according to the research"
-        ]
-        for pat in hallucinated_patterns:
-            matches = re.findall(pat, summary, flags=re.IGNORECASE)
-            for m in matches:
-                if m.lower() not in source_text.lower():
-                    summary = re.sub(re.escape(m), '', summary, flags=re.IGNORECASE)
+        source_lower = Document.of(source_text).lower
+        in_source = {}
+        # One scan for every pattern; keep the text between hits that don't appear in the source
+        kept = []
+        last = 0
+        for start, end, phrase, _ in HALLUCINATION_MATCHER.finditer(summary):
+            if start < last:
+                # Inside an attribution clause that's already been cut
+                continue
+            key = phrase.lower()
+            if key not in in_source:
+                in_source[key] = key in source_lower
+            if in_source[key] and key == "according to":
+                # A real "according to" can still introduce an invented source
+                clause = ATTRIBUTION_CLAUSE.match(summary, start)
+                if clause:
+                    end = clause.end()
+                    key = clause.group().lower()
+                    if key not in in_source:
+                        in_source[key] = key in source_lower
+            if not in_source[key]:
+                kept.append(summary[last:start])
+                last = end
+        kept.append(summary[last:])
+        summary = ''.join(kept)
         # Clean up extra spaces and punctuation
         summary = re.sub(r'\s+', ' ', summary).strip()
         summary = re.sub(r'\s+([.,!?])', r'\1', summary)
@@ -149,99 +356,222 @@ class Pipeline:
     def remove_irrelevant_lines(self, summary, credible_text):
         """Remove lines from summary that are not contextually present in the credible input."""
         summary_lines = summary.split('. ')
+        credible_words = Document.of(credible_text).word_set
         filtered = []
         for line in summary_lines:
             # Only keep lines that share at least 2 words with the credible input
             words = set(line.lower().split())
-            credible_words = set(credible_text.lower().split())
             if len(words & credible_words) >= 2:
                 filtered.append(line)
         return '.'.join(filtered)
 
 def print_progress(message):
-    """Print progress message with animation"""
-    print(f"\n{message}", end="", file=sys.stderr)
-    for _ in range(3):
-        sleep(0.3)
-        print(".", end="", file=sys.stderr)
-    print(file=sys.stderr)
-
-def process_text(input_text, return_definitions=False):
-    """Run the pipeline on input text and return summary and definitions if requested."""
-    import concurrent.futures
+    """Print a stage progress message; used as the CLI's Pipeline progress callback."""
+    print(f"\n{message}...", file=sys.stderr)
+
+_pipeline = None
+_pipeline_lock = threading.Lock()
+_ready = threading.Event()
+
+def get_pipeline():
+    """Process-wide Pipeline, built on first use and reused by every request."""
+    global _pipeline
+    if _pipeline is None:
+        with _pipeline_lock:
+            if _pipeline is None:
+                _pipeline = Pipeline()
+    return _pipeline
+
+def warmup():
+    """Load NLTK data, the summarization model and the shared pipeline ahead of the first request."""
+    ensure_nltk_data()
+    get_fast_summarizer()
+    get_pipeline()
+    get_dejargonifier()
+    _ready.set()
+    # Not needed to serve, so it doesn't hold up readiness: without a prebuilt
+    # simple_lexicon.tsv, simplify_text falls back to per-word WordNet queries until this finishes
+    get_simple_lexicon().ensure_built()
+
+def is_ready():
+    return _ready.is_set()
+
+def get_metrics():
+    """Process-wide stage timings and counters, plus cache and batching stats."""
+    metrics = METRICS.snapshot()
+    metrics["context_cache"] = get_shared_cache().get_stats()
+    batching = batching_stats()
+    if batching is not None:
+        metrics["summary_batching"] = batching
+    metrics["result_cache"] = get_result_cache().get_stats()
+    metrics["hosts"] = get_host_health().snapshot()
+    workers = model_worker_stats()
+    if workers is not None:
+        metrics["model_workers"] = workers
+    return metrics
+
+# Keywords looked up for the definitions panel, and how many when the budget is tight
+DEFINITION_KEYWORDS = 5
+DEGRADED_DEFINITION_KEYWORDS = 2
+DEFINITION_ESTIMATE = 1.0
+
+def fetch_definitions(input_text, executor):
+    """Look up definitions for the top keywords of input_text (a str or Document) using executor's threads."""
+    definitions = {}
+    deadline = current_deadline()
     try:
-        pipeline = Pipeline()
-        # Fast path: skip weighting if text is long, just summarize and extract keywords
-        if not isinstance(input_text, str):
-            input_text = str(input_text)
-        if len(input_text.split()) > 400:
-            with concurrent.futures.ThreadPoolExecutor(max_workers=6) as executor:
-                summary_future = executor.submit(pipeline.summarizer.summarize, input_text, True, 60, 15)
-                definitions = {}
-                try:
-                    from Rusty.keyword_dejargonifier import KeywordDejargonifier
-                    dejargonifier = KeywordDejargonifier()
-                    keywords = dejargonifier.extract_keywords(input_text)
-                    if not isinstance(keywords, list):
-                        keywords = list(keywords)
-                    keywords = [k for k in keywords if isinstance(k, str) and len(k) > 4][:5]
-                    def_futures = {k: executor.submit(dejargonifier.fetch_context, k) for k in keywords}
-                    for k, fut in def_futures.items():
-                        try:
-                            defn = fut.result(timeout=6)
-                            if isinstance(defn, str) and isinstance(k, str) and k.lower() in defn.lower() and 'film' not in defn.lower() and 'movie' not in defn.lower():
-                                definitions[k] = defn
-                        except Exception:
-                            continue
-                except Exception:
-                    definitions = {}
-                summary = summary_future.result(timeout=10)
-            if return_definitions:
-                return summary, definitions
-            else:
-                return summary
-        # Normal path for short/medium text
-        lines = input_text.split('\n')
-        if len(lines) > 50:
-            lines = lines[:50]
-            input_text = '\n'.join(lines)
-        with concurrent.futures.ThreadPoolExecutor(max_workers=6) as executor:
-            weighted_future = executor.submit(pipeline.run, input_text)
-            definitions = {}
+        dejargonifier = get_dejargonifier()
+        keywords = dejargonifier.extract_keywords(input_text)
+        if not isinstance(keywords, list):
+            keywords = list(keywords)
+        limit = DEFINITION_KEYWORDS
+        if not deadline.allows("definitions", DEFINITION_ESTIMATE):
+            deadline.degrade("definitions")
+            limit = DEGRADED_DEFINITION_KEYWORDS
+        keywords = [k for k in keywords if isinstance(k, str) and len(k) > 4][:limit]
+        def_futures = {k: submit(executor, dejargonifier.fetch_context, k) for k in keywords}
+        for k, fut in def_futures.items():
             try:
-                from Rusty.keyword_dejargonifier import KeywordDejargonifier
-                dejargonifier = KeywordDejargonifier()
-                keywords = dejargonifier.extract_keywords(input_text)
-                if not isinstance(keywords, list):
-                    keywords = list(keywords)
-                keywords = [k for k in keywords if isinstance(k, str) and len(k) > 4][:5]
-                def_futures = {k: executor.submit(dejargonifier.fetch_context, k) for k in keywords}
-                for k, fut in def_futures.items():
-                    try:
-                        defn = fut.result(timeout=6)
-                        if isinstance(defn, str) and isinstance(k, str) and k.lower() in defn.lower() and 'film' not in defn.lower() and 'movie' not in defn.lower():
-                            definitions[k] = defn
-                    except Exception:
-                        continue
+                defn = fut.result(timeout=deadline.timeout(6))
+                if isinstance(defn, str) and isinstance(k, str) and k.lower() in defn.lower() and 'film' not in defn.lower() and 'movie' not in defn.lower():
+                    definitions[k] = defn
+            except concurrent.futures.TimeoutError:
+                if deadline.expired():
+                    # Out of budget: answer with what's resolved and drop the rest
+                    deadline.degrade("definitions")
+                    for pending in def_futures.values():
+                        pending.cancel()
+                    break
             except Exception:
-                definitions = {}
+                continue
+    except Exception:
+        definitions = {}
+    return definitions
+
+def process_document(input_text, sinks=None, progress=None, mode="abstractive", budget_ms=None, on_event=None):
+    """Run the pipeline on input text and return its summary, definitions and request metrics.
+
+    mode="extractive" builds the summary from the text's own sentences without the model.
+    budget_ms sets a latency budget: stages that won't fit are degraded or skipped
+    instead of overrunning, and the response's "degraded" list names them.
+    on_event(event) is handed "line" and "definitions" events as they are ready
+    (see stream_process_text); a cached result replays the lines it was stored with.
+    """
+    if mode not in MODES:
+        raise ValueError(f"unknown mode {mode!r}; expected one of {', '.join(MODES)}")
+    pipeline = Pipeline(sinks=sinks, progress=progress) if sinks or progress else get_pipeline()
+    doc = Document.of(input_text)
+    # Sinks and progress callbacks expect a real run, and so does a profiled request,
+    # so those calls bypass the result cache
+    cache = None if sinks or progress or current_profile() is not None else get_result_cache()
+    config = f"{RESULT_CONFIG}|{mode}"
+    # Weighted lines are kept with the cached result so a streamed cache hit can replay them
+    lines = []
+
+    def emit(event):
+        if event["type"] == "line":
+            lines.append(event)
+        _emit(on_event, event)
+
+    with recording() as recorder, span("request"), deadline_scope(budget_ms) as deadline:
+        cached = cache.get("process", doc.text, config) if cache is not None else None
+        if cached is not None:
+            summary, definitions = cached["summary"], cached["definitions"]
+            for index, (line, confidence) in enumerate(cached.get("lines", [])):
+                _emit(on_event, {"type": "line", "index": index, "line": line, "confidence": confidence})
+            _emit(on_event, {"type": "definitions", "definitions": definitions})
+        else:
+            if mode == "extractive":
+                summary, definitions, complete = _run_extractive(doc, emit)
+            else:
+                summary, definitions, complete = _run_document(pipeline, doc, emit)
+            # Degraded results are only what this budget allowed; don't serve them to others
+            if cache is not None and complete and summary and not deadline.degraded:
+                weighted_lines = [[event["line"], event["confidence"]] for event in sorted(lines, key=lambda e: e["index"])]
+                cache.set("process", doc.text, config,
+                          {"summary": summary, "definitions": definitions, "lines": weighted_lines})
+    return {"summary": summary, "definitions": definitions, "metrics": recorder.snapshot(),
+            "degraded": list(deadline.degraded)}
+
+def _emit(on_event, event):
+    if on_event is not None:
+        on_event(event)
+
+def _fetch_definitions(doc, executor, on_event):
+    definitions = fetch_definitions(doc, executor)
+    _emit(on_event, {"type": "definitions", "definitions": definitions})
+    return definitions
+
+def _run_extractive(doc, on_event=None):
+    def summarize():
+        with span("extractive_summary"):
+            return get_extractive_summarizer().summarize(doc.text, top_n=EXTRACTIVE_SENTENCES)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=6) as executor:
+        summary_future = submit(executor, summarize)
+        definitions = _fetch_definitions(doc, executor, on_event)
+        return summary_future.result(), definitions, True
+
+def _run_document(pipeline, doc, on_event=None):
+    """Compute (summary, definitions, complete) for doc; complete is False if a stage timed out."""
+    deadline = current_deadline()
+    extractive = get_extractive_summarizer()
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=6)
+    try:
+        # Fast path: skip weighting if text is long, just summarize and extract keywords
+        if doc.word_count > 400:
+            # Drop peripheral and repeated sentences first, then map-reduce over what's left
+            # rather than the model's first 512 tokens
+            with span("extractive_prefilter"):
+                text = extractive.shrink(doc.text, LONG_INPUT_WORDS)
+            if not deadline.allows("long_summary", STAGE_ESTIMATES["long_summary"]):
+                deadline.degrade("long_summary")
+                return extractive.summarize(text, top_n=EXTRACTIVE_SENTENCES), _fetch_definitions(doc, executor, on_event), True
+
+            def summarize_long():
+                with span("long_summary"):
+                    return pipeline.summarizer.summarize_long(text, 60, 15)
+            summary_future = submit(executor, summarize_long)
+            definitions = _fetch_definitions(doc, executor, on_event)
             try:
-                weighted_lines = weighted_future.result(timeout=60)
+                return summary_future.result(timeout=deadline.timeout(60)), definitions, True
             except concurrent.futures.TimeoutError:
-                print("\n ! Warning: assign_weights timed out", file=sys.stderr)
-                weighted_lines = []
-        # Defensive: if weighted_lines is not a list of (line, confidence) tuples, fix it
-        if not weighted_lines or not (isinstance(weighted_lines, list) and all(isinstance(x, (list, tuple)) and len(x) == 2 for x in weighted_lines)):
-            weighted_lines = []
+                deadline.degrade("long_summary")
+                return extractive.summarize(text, top_n=EXTRACTIVE_SENTENCES), definitions, False
+        # Normal path for short/medium text
+        lines = doc.text.split('\n')
+        if len(lines) > 50:
+            doc = Document('\n'.join(lines[:50]))
+        # The pipeline and the definition lookups share doc's tokens and keywords
+        on_line = None
+        if on_event is not None:
+            def on_line(index, line, confidence):
+                on_event({"type": "line", "index": index, "line": line, "confidence": confidence})
+        weighted_future = submit(executor, pipeline.run, doc, on_line)
+        definitions = _fetch_definitions(doc, executor, on_event)
         try:
-            with open("output_final_summary.txt", "r") as f:
-                summary = f.read().strip()
-        except Exception:
-            summary = ""
+            result = weighted_future.result(timeout=deadline.timeout(60))
+        except concurrent.futures.TimeoutError:
+            print("\n ! Warning: assign_weights timed out", file=sys.stderr)
+            # The run notices the expired deadline at its next stage and stops
+            deadline.degrade("pipeline")
+            return extractive.summarize(doc.text, top_n=EXTRACTIVE_SENTENCES), definitions, False
+        summary = result.summary.strip()
+        if not summary and deadline.degraded:
+            # Cut-short lookups can leave no line credible enough to summarize
+            summary = extractive.summarize(doc.text, top_n=EXTRACTIVE_SENTENCES)
+        return summary, definitions, True
+    finally:
+        # Return as soon as the answer is ready; queued lookups nobody will read are dropped
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def process_text(input_text, return_definitions=False, sinks=None, progress=None, mode="abstractive", budget_ms=None):
+    """Run the pipeline on input text and return summary and definitions if requested."""
+    try:
+        response = process_document(input_text, sinks=sinks, progress=progress, mode=mode, budget_ms=budget_ms)
         if return_definitions:
-            return summary, definitions
+            return response["summary"], response["definitions"]
         else:
-            return summary
+            return response["summary"]
     except KeyboardInterrupt:
         print("\n\n Error: Process interrupted by user", file=sys.stderr)
         sys.exit(1)
@@ -251,8 +581,122 @@ def process_text(input_text, return_definitions=False):
         traceback.print_exc(file=sys.stderr)
         return {'output': f'Error: {str(e)}'}
 
+def stream_process_text(input_text, mode="abstractive", budget_ms=None):
+    """Run the pipeline on input text, yielding result events as soon as each is ready.
+
+    Events are dicts with a "type" of "line" (one weighted line), "definitions",
+    "summary", "metrics" (with the "degraded" stages) or "error"; the generator
+    ends after the metrics event. It goes through process_document, so mode,
+    budget_ms and the result cache behave as they do for /process.
+    """
+    events = queue.Queue()
+
+    def work():
+        try:
+            response = process_document(input_text, mode=mode, budget_ms=budget_ms, on_event=events.put)
+            events.put({"type": "summary", "summary": response["summary"]})
+            events.put({"type": "metrics", "metrics": response["metrics"], "degraded": response["degraded"]})
+        except Exception as e:
+            traceback.print_exc(file=sys.stderr)
+            events.put({"type": "error", "error": str(e)})
+        finally:
+            events.put(None)
+
+    threading.Thread(target=work, name='stream-process', daemon=True).start()
+    while True:
+        event = events.get()
+        if event is None:
+            return
+        yield event
+
+# Documents processed at once by process_batch; bounds memory however long the input is
+BATCH_IN_FLIGHT = 4
+
+def parse_jsonl_documents(lines):
+    """Turn JSONL lines into {"id", "text"} documents for process_batch.
+
+    Each line is either a JSON string or an object with "text" (and optionally
+    "id"; the line number is used otherwise). Lines that don't parse become
+    {"id", "error"} items so one bad record doesn't end the run.
+    """
+    for number, line in enumerate(lines):
+        if isinstance(line, bytes):
+            line = line.decode('utf-8', errors='replace')
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield {"id": number, "error": f"invalid JSON: {e}"}
+            continue
+        if isinstance(record, str):
+            yield {"id": number, "text": record}
+        elif isinstance(record, dict):
+            yield {"id": record.get("id", number), "text": record.get("text", "")}
+        else:
+            yield {"id": number, "error": "expected a JSON string or object"}
+
+def _process_batch_item(document, mode="abstractive", budget_ms=None):
+    if "error" in document:
+        return document
+    text = document.get("text")
+    if not isinstance(text, str) or not text.strip():
+        return {"id": document.get("id"), "error": "No input text provided."}
+    try:
+        return {"id": document.get("id"), **process_document(text, mode=mode, budget_ms=budget_ms)}
+    except Exception as e:
+        traceback.print_exc(file=sys.stderr)
+        return {"id": document.get("id"), "error": str(e)}
+
+def process_batch(documents, max_in_flight=BATCH_IN_FLIGHT, mode="abstractive", budget_ms=None):
+    """Process an iterable of {"id", "text"} documents, yielding one result per document in input order.
+
+    Up to max_in_flight documents run at once, so one document's tokenization and
+    web lookups overlap with another's model calls (which the batch scheduler
+    merges when batching is enabled). Input is consumed lazily and at most
+    max_in_flight results are held, so memory stays flat over any number of
+    documents. Failures are reported as {"id", "error"} results.
+    """
+    pending = collections.deque()
+    documents = iter(documents)
+    # Plain submit (not instrumentation.submit): each document records its own metrics
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix='batch-doc') as executor:
+        for document in documents:
+            pending.append(executor.submit(_process_batch_item, document, mode, budget_ms))
+            if len(pending) >= max_in_flight:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def run_jsonl(input_stream, output_stream, max_in_flight=BATCH_IN_FLIGHT, mode="abstractive"):
+    """Read JSONL documents from input_stream and write one JSON result per line to output_stream."""
+    # Documents in flight share model batches instead of queueing on the model one by one
+    enable_batching()
+    processed = failed = 0
+    for result in process_batch(parse_jsonl_documents(input_stream), max_in_flight=max_in_flight, mode=mode):
+        processed += 1
+        failed += "error" in result
+        output_stream.write(json.dumps(result) + "\n")
+        output_stream.flush()
+    print(f"\n Processed {processed} documents ({failed} failed)", file=sys.stderr)
+    return failed
+
 def main():
     """Main entry point with input handling"""
+    parser = argparse.ArgumentParser(description="Summarize and dejargonify text from stdin.")
+    parser.add_argument('--jsonl', action='store_true',
+                        help='read one document per line (a JSON string or {"id", "text"}) and write JSONL results to stdout')
+    parser.add_argument('--jobs', type=int, default=BATCH_IN_FLIGHT, help='documents processed at once in --jsonl mode')
+    parser.add_argument('--mode', choices=MODES, default="abstractive",
+                        help='"extractive" summarizes by sentence selection, without the model')
+    parser.add_argument('--profile', metavar='PATH',
+                        help='sample the run\'s stacks and write them to PATH in collapsed (flamegraph.pl) format')
+    args = parser.parse_args()
+    if args.profile and args.jsonl:
+        parser.error('--profile profiles a single document and cannot be combined with --jsonl')
+    if args.jsonl:
+        run_jsonl(sys.stdin, sys.stdout, max_in_flight=max(1, args.jobs), mode=args.mode)
+        return
     if sys.stdin.isatty():  # If running interactively
         print("\n Content (press Ctrl+D when finished):", file=sys.stderr)
         lines = []
@@ -267,7 +711,18 @@ def main():
     if not text.strip():
         print("\n Error: No input", file=sys.stderr)
         sys.exit(1)
-    process_text(text)
+    # The CLI keeps writing the legacy output files next to where it's run
+    if args.profile:
+        with profiling() as profile:
+            summary = process_text(text, sinks=[FileExportSink()], progress=print_progress, mode=args.mode)
+        with open(args.profile, 'w') as f:
+            f.write(profile.collapsed())
+        print(f"\n Wrote {profile.sample_count} profile samples to {args.profile}", file=sys.stderr)
+    else:
+        summary = process_text(text, sinks=[FileExportSink()], progress=print_progress, mode=args.mode)
+    # Progress and the per-line analysis go to stderr; stdout carries only the summary
+    if isinstance(summary, str):
+        print(summary)
 
 if __name__ == "__main__":
     main()
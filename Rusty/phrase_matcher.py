@@ -0,0 +1,42 @@
+import re
+
+class PhraseMatcher:
+    """Many patterns compiled into one alternation, so a text is scanned once for all of them.
+
+    Patterns are tried in list order at each position and matches don't overlap,
+    so list longer phrasings before their prefixes. Literal phrases are sorted
+    longest-first automatically.
+    """
+
+    def __init__(self, patterns, literal=False, flags=re.IGNORECASE):
+        self.patterns = sorted(patterns, key=len, reverse=True) if literal else list(patterns)
+        parts = [re.escape(p) if literal else p for p in self.patterns]
+        self.regex = re.compile('|'.join(f'(?P<p{i}>{part})' for i, part in enumerate(parts)), flags)
+
+    def finditer(self, text):
+        """Yield (start, end, matched_text, pattern_index) for every hit, left to right."""
+        for m in self.regex.finditer(text):
+            yield m.start(), m.end(), m.group(), int(m.lastgroup[1:])
+
+    def find_all(self, text):
+        return list(self.finditer(text))
+
+    def search(self, text):
+        return self.regex.search(text) is not None
+
+# Phrases that flag a sentence as a claim worth keeping (compress_sentences)
+CLAIM_PHRASES = [
+    "says", "claims", "study", "suggests", "warns", "proves", "shows", "disproves", "alleges", "confirms", "allegedly", "reported", "reportedly", "research", "researchers", "scientists", "states", "experts", "'", "findings", "evidence", "evidently", "concludes", "conclusion", "concluded", "concludes that", "concluded that", '"', "according to", "according to experts", "according to researchers", "according to scientists", "according to the study", "according to the research"
+]
+
+# Attribution phrases the summarizer tends to invent (Pipeline.remove_hallucinations).
+# "concluded that" precedes "concludes?" so it's dropped whole rather than leaving "d that";
+# "according to" stays ahead of its open-ended clause, which is only checked when
+# "according to" itself is in the source (ATTRIBUTION_CLAUSE)
+HALLUCINATED_PATTERNS = [
+    r"i'?m not a big fan[,.]?", r"says [A-Za-z]+", r"according to", r"warns", r"claims", r"study", r"experts?", r"scientists?", r"doctors?", r"alleges?", r"confirms?", r"allegedly", r"reportedly", r"reported", r"research", r"findings", r"evidence", r"concluded that", r"concludes that", r"conclusion", r"concludes?"
+]
+ATTRIBUTION_CLAUSE = re.compile(r"according to [A-Za-z ]+", re.IGNORECASE)
+
+CLAIM_MATCHER = PhraseMatcher(CLAIM_PHRASES, literal=True)
+HALLUCINATION_MATCHER = PhraseMatcher(HALLUCINATED_PATTERNS)
@@ -0,0 +1,118 @@
+import contextvars
+import os
+import re
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+
+# Time between samples; every registered thread's stack is recorded on each one
+SAMPLE_INTERVAL_MS = float(os.environ.get('RUSTY_PROFILE_INTERVAL_MS', 5))
+
+_THREAD_NUMBER = re.compile(r'[-_]?\d+')
+
+def _frame_label(code):
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+class Profile:
+    """Sampling profile of one request across every thread working on it.
+
+    The thread that opened the profile and each task handed to a pool through
+    instrumentation.submit register themselves for as long as they run; a
+    sampler thread reads their stacks with sys._current_frames() every
+    interval_ms. collapsed() gives the result in the folded-stack format that
+    flamegraph.pl and speedscope read: one "root;caller;callee count" line per
+    distinct stack, rooted at the thread's name with its pool number stripped.
+    """
+
+    def __init__(self, interval_ms=SAMPLE_INTERVAL_MS):
+        self.interval = interval_ms / 1000.0
+        self.samples = Counter()
+        self.sample_count = 0
+        self._threads = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler = None
+
+    def register(self):
+        """Sample the calling thread until unregister(); returns a token for it."""
+        ident = threading.get_ident()
+        with self._lock:
+            self._threads[ident] = _THREAD_NUMBER.sub('', threading.current_thread().name) or 'thread'
+        return ident
+
+    def unregister(self, ident):
+        with self._lock:
+            self._threads.pop(ident, None)
+
+    def wrap(self, fn):
+        """fn, registering whichever thread runs it for the duration of the call."""
+        def run(*args, **kwargs):
+            ident = self.register()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.unregister(ident)
+        return run
+
+    def start(self):
+        self._sampler = threading.Thread(target=self._sample_loop, name='profiler', daemon=True)
+        self._sampler.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+
+    def _sample_loop(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def sample(self):
+        with self._lock:
+            threads = dict(self._threads)
+        if not threads:
+            return
+        frames = sys._current_frames()
+        for ident, name in threads.items():
+            frame = frames.get(ident)
+            codes = []
+            while frame is not None:
+                # The registration wrapper would otherwise sit at the base of every worker stack
+                if frame.f_code.co_filename != __file__:
+                    codes.append(frame.f_code)
+                frame = frame.f_back
+            if codes:
+                self.samples[(name, tuple(reversed(codes)))] += 1
+        self.sample_count += 1
+
+    def collapsed(self):
+        """Folded stacks, heaviest first."""
+        folded = Counter()
+        for (name, codes), count in self.samples.items():
+            folded[';'.join([name] + [_frame_label(code) for code in codes])] += count
+        return ''.join(f"{stack} {count}\n" for stack, count in folded.most_common())
+
+_current = contextvars.ContextVar('rusty_profile', default=None)
+
+def current_profile():
+    """The enclosing request's Profile, or None when it isn't being profiled."""
+    return _current.get()
+
+@contextmanager
+def profiling(interval_ms=SAMPLE_INTERVAL_MS):
+    """Profile the enclosed work, including pool tasks it submits; reuses an enclosing profile if any."""
+    profile = _current.get()
+    if profile is not None:
+        yield profile
+        return
+    profile = Profile(interval_ms)
+    ident = profile.register()
+    token = _current.set(profile)
+    profile.start()
+    try:
+        yield profile
+    finally:
+        profile.stop()
+        _current.reset(token)
+        profile.unregister(ident)
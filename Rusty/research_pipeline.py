@@ -1,55 +1,151 @@
-import requests
 from bs4 import BeautifulSoup
-from Rusty.init_summarizer import Summarizer
+from init_summarizer import Summarizer, SUMMARY_MODEL, SUMMARY_BACKEND
+from local_index import LIVE_FETCH, LOCAL_INDEX_PATH, get_local_index
+from instrumentation import incr
+from result_cache import get_result_cache
+from host_health import get_host_health
+from profiling import current_profile
+
+WIKIPEDIA_BASES = [
+    'https://simple.wikipedia.org/wiki/',
+    'https://en.wikipedia.org/wiki/',
+]
+
+def wikipedia_urls(topic):
+    return [base + topic.replace(" ", "_") for base in WIKIPEDIA_BASES]
+
+class WikipediaPage:
+    """A Wikipedia article parsed once into its paragraphs and a heading -> paragraphs index."""
+
+    def __init__(self, html):
+        soup = BeautifulSoup(html, 'html.parser')
+        self.paragraphs = []
+        # (lowercased heading, index of the first paragraph after it), in document order
+        headings = []
+        for el in soup.find_all(['h2', 'h3', 'span', 'p']):
+            if el.name == 'p':
+                self.paragraphs.append(el.text)
+            elif el.name != 'span' or 'mw-headline' in (el.get('class') or []):
+                heading = el.get_text().strip().lower()
+                if heading:
+                    headings.append((heading, len(self.paragraphs)))
+        # Each heading -> the paragraphs that follow it up to the next heading, in document order
+        self.sections = {}
+        bounds = [start for _, start in headings[1:]] + [len(self.paragraphs)]
+        for (heading, start), end in zip(headings, bounds):
+            self.sections.setdefault(heading, []).extend(self.paragraphs[start:end])
+
+    def lead(self):
+        if self.paragraphs and len(self.paragraphs[0]) > 40:
+            return self.paragraphs[0].strip()
+        return None
+
+    def _find_section(self, section):
+        name = section.lower()
+        paragraphs = self.sections.get(name)
+        if paragraphs is not None:
+            return paragraphs
+        # No heading is exactly the name: take the first one containing it ("Early history")
+        for heading, paragraphs in self.sections.items():
+            if name in heading:
+                return paragraphs
+        return None
+
+    def section(self, section=None):
+        """Return the first paragraph under the heading named section (or containing it), else the lead paragraph."""
+        if section:
+            paragraphs = self._find_section(section)
+            if paragraphs and len(paragraphs[0]) > 40:
+                return paragraphs[0].strip()
+        return self.lead()
+
+class WikipediaTopic:
+    """Fetches the simple/en pages for a topic at most once each, only as far as lookups need.
+
+    Lead-paragraph lookups are answered from the local abstracts index when one is
+    configured; it has no section text, so named sections still come from the live
+    pages and only fall back to the indexed abstract.
+    """
+
+    def __init__(self, topic, local_index=None, live=LIVE_FETCH):
+        self.topic = topic
+        self.urls = wikipedia_urls(topic) if live else []
+        self.local_index = local_index if local_index is not None else get_local_index()
+        self._pages = {}
+
+    def _local_lead(self):
+        if self.local_index is None:
+            return None
+        return self.local_index.lookup(self.topic)
+
+    def _page(self, url):
+        if url not in self._pages:
+            page = None
+            incr('network_fetches')
+            try:
+                # Skipped at once if the host's breaker is open; otherwise an adaptive timeout of at most 6s
+                resp = get_host_health().get(url, timeout=6)
+                if resp.status_code == 200:
+                    page = WikipediaPage(resp.text)
+            except Exception:
+                pass
+            self._pages[url] = page
+        return self._pages[url]
+
+    def section(self, section=None):
+        if not section:
+            lead = self._local_lead()
+            if lead:
+                return lead
+        for url in self.urls:
+            page = self._page(url)
+            if page is not None:
+                text = page.section(section)
+                if text:
+                    return text
+        return self._local_lead() if section else None
 
 def fetch_wikipedia_section(topic, section=None):
-    urls = [
-        f'https://simple.wikipedia.org/wiki/{topic.replace(" ", "_")}',
-        f'https://en.wikipedia.org/wiki/{topic.replace(" ", "_")}'
-    ]
-    for url in urls:
-        try:
-            resp = requests.get(url, timeout=6)
-            if resp.status_code == 200:
-                soup = BeautifulSoup(resp.text, 'html.parser')
-                if section:
-                    header = soup.find(['span', 'h2', 'h3'], string=lambda s: s and section.lower() in s.lower())
-                    if header:
-                        p = header.find_next('p')
-                        if p and len(p.text) > 40:
-                            return p.text.strip()
-                # fallback: first paragraph
-                p = soup.find('p')
-                if p and len(p.text) > 40:
-                    return p.text.strip()
-        except Exception:
-            pass
-    return None
+    return WikipediaTopic(topic).section(section)
+
+RESEARCH_CONFIG = f"{SUMMARY_MODEL}|{SUMMARY_BACKEND}|{LOCAL_INDEX_PATH}|{LIVE_FETCH}"
 
 def process_research_topic(topic):
+    # A profiled request wants the real run, not a cache hit
+    if current_profile() is not None:
+        return _research_topic(topic)
+    cache = get_result_cache()
+    cached = cache.get('research', topic, RESEARCH_CONFIG)
+    if cached is not None:
+        return cached
+    result = _research_topic(topic)
+    # An all-empty result usually means the lookups failed; don't pin that for a day
+    if any(result.values()):
+        cache.set('research', topic, RESEARCH_CONFIG, result)
+    return result
+
+def _research_topic(topic):
     summarizer = Summarizer()
+    # Every lookup below reads from the same fetched-and-parsed pages
+    wiki = WikipediaTopic(topic)
     # Definition
-    definition = fetch_wikipedia_section(topic, section='definition')
-    if not definition:
-        definition = fetch_wikipedia_section(topic)
+    definition = wiki.section('definition')
     if definition:
         definition = summarizer.summarize(definition, fast=True, max_length=40, min_length=10)
     # Overview
-    overview = fetch_wikipedia_section(topic, section='overview')
-    if not overview:
-        overview = fetch_wikipedia_section(topic)
+    overview = wiki.section('overview')
     if overview:
         overview = summarizer.summarize(overview, fast=True, max_length=60, min_length=15)
     # History
-    history = fetch_wikipedia_section(topic, section='history')
+    history = wiki.section('history')
     if history:
         history = summarizer.summarize(history, fast=True, max_length=60, min_length=15)
     # Derivation (optional)
-    derivation = fetch_wikipedia_section(topic, section='derivation')
+    derivation = wiki.section('derivation')
     if derivation:
         derivation = summarizer.summarize(derivation, fast=True, max_length=60, min_length=15)
     # Deep dive (try to get a longer section)
-    deepdive = fetch_wikipedia_section(topic)
+    deepdive = wiki.section()
     if deepdive:
         deepdive = summarizer.summarize(deepdive, fast=True, max_length=120, min_length=30)
     return {
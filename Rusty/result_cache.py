@@ -0,0 +1,243 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import unicodedata
+from cache_store import ExpiringLRU, SQLiteStore
+from instrumentation import incr
+
+DEFAULT_RESULT_CACHE_PATH = os.environ.get(
+    'RUSTY_RESULT_CACHE',
+    os.path.join(os.path.expanduser('~'), '.cache', 'veridejargon', 'results.sqlite3')
+)
+
+# SimHash fingerprints within this many bits of each other count as the same document;
+# a one- or two-word edit to a 150-word article usually moves 1-6 bits, unrelated texts ~32
+NEAR_DUPLICATE_BITS = 6
+# Below this many words a few edits change the meaning, so only exact matches are reused
+NEAR_DUPLICATE_MIN_WORDS = 40
+# 64-bit fingerprints split into NEAR_DUPLICATE_BITS + 1 bands (any leftover top bits unused):
+# two fingerprints within NEAR_DUPLICATE_BITS of each other agree on at least one band
+BANDS = NEAR_DUPLICATE_BITS + 1
+BAND_BITS = 64 // BANDS
+
+_WORD = re.compile(r"\w+")
+_QUOTES = str.maketrans({'‘': "'", '’': "'", '“': '"', '”': '"', '–': '-', '—': '-'})
+
+def normalize(text):
+    """Case-, whitespace- and typography-insensitive form of text used for hashing."""
+    text = unicodedata.normalize('NFKC', text).translate(_QUOTES)
+    return ' '.join(text.lower().split())
+
+def content_key(kind, text, config):
+    digest = hashlib.sha256()
+    digest.update(f'{kind}\0{config}\0'.encode('utf-8'))
+    digest.update(normalize(text).encode('utf-8'))
+    return digest.hexdigest()
+
+def simhash(text, shingle=3):
+    """64-bit SimHash over word shingles; lightly edited copies differ in only a few bits."""
+    words = _WORD.findall(normalize(text))
+    if len(words) < shingle:
+        shingles = [' '.join(words)]
+    else:
+        shingles = [' '.join(words[i:i + shingle]) for i in range(len(words) - shingle + 1)]
+    weights = [0] * 64
+    for s in shingles:
+        h = int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=8).digest(), 'big')
+        for bit in range(64):
+            weights[bit] += 1 if h >> bit & 1 else -1
+    return sum(1 << bit for bit in range(64) if weights[bit] > 0)
+
+def bands(fingerprint):
+    mask = (1 << BAND_BITS) - 1
+    return [(fingerprint >> (i * BAND_BITS)) & mask for i in range(BANDS)]
+
+def hamming(a, b):
+    return bin(a ^ b).count('1')
+
+def _signed(fingerprint):
+    # SQLite integers are signed 64-bit
+    return fingerprint - (1 << 64) if fingerprint >= 1 << 63 else fingerprint
+
+class ResultCache:
+    """Whole-request results keyed on normalized content hash plus pipeline config.
+
+    An in-process LRU sits in front of an optional SQLite file. Long texts also
+    get a SimHash fingerprint, indexed by band, so a copy of an article with a
+    few words changed is served the original's cached result.
+    """
+
+    def __init__(self, path=DEFAULT_RESULT_CACHE_PATH, max_entries=1024, ttl=24 * 3600,
+                 near_bits=NEAR_DUPLICATE_BITS, near_min_words=NEAR_DUPLICATE_MIN_WORDS):
+        self.ttl = ttl
+        self.near_bits = min(near_bits, NEAR_DUPLICATE_BITS)
+        self.near_min_words = near_min_words
+        # key -> (kind, config, fingerprint or None, json value), with its expiry
+        self._memory = ExpiringLRU(max_entries, on_evict=self._unindex)
+        # (kind, config, band index, band value) -> keys
+        self._bands = {}
+        self._lock = threading.Lock()
+        self.stats = {'exact_hits': 0, 'near_hits': 0, 'misses': 0, 'stores': 0}
+        self._disk = SQLiteStore(path, [
+            'CREATE TABLE IF NOT EXISTS results ('
+            'key TEXT PRIMARY KEY, kind TEXT, config TEXT, fingerprint INTEGER, '
+            + ', '.join(f'b{i} INTEGER' for i in range(BANDS)) +
+            ', value TEXT, expires_at REAL NOT NULL)'
+        ] + [
+            f'CREATE INDEX IF NOT EXISTS results_b{i} ON results (kind, config, b{i})' for i in range(BANDS)
+        ])
+
+    def _fingerprint(self, text):
+        if len(text.split()) < self.near_min_words:
+            return None
+        return simhash(text)
+
+    def get(self, kind, text, config=''):
+        """Return the cached result for text (or a near-duplicate of it), or None."""
+        key = content_key(kind, text, config)
+        value = self._get_exact(key)
+        if value is not None:
+            with self._lock:
+                self.stats['exact_hits'] += 1
+            incr('result_cache_hits')
+            return value
+        fingerprint = self._fingerprint(text)
+        if fingerprint is not None:
+            value = self._get_near(kind, config, fingerprint)
+            if value is not None:
+                with self._lock:
+                    self.stats['near_hits'] += 1
+                incr('result_cache_hits')
+                incr('result_cache_near_hits')
+                return value
+        with self._lock:
+            self.stats['misses'] += 1
+        incr('result_cache_misses')
+        return None
+
+    def _get_exact(self, key):
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key, now)
+        if entry is not None:
+            return json.loads(entry[3])
+        if self._disk.enabled:
+            try:
+                row = self._disk.connection().execute(
+                    'SELECT kind, config, fingerprint, value, expires_at FROM results WHERE key = ?', (key,)
+                ).fetchone()
+            except Exception:
+                row = None
+            if row is not None and row[4] > now:
+                fingerprint = None if row[2] is None else row[2] & ((1 << 64) - 1)
+                self._remember(key, row[0], row[1], fingerprint, row[3], row[4])
+                return json.loads(row[3])
+        return None
+
+    def _get_near(self, kind, config, fingerprint):
+        now = time.time()
+        with self._lock:
+            candidates = set()
+            for i, band in enumerate(bands(fingerprint)):
+                candidates.update(self._bands.get((kind, config, i, band), ()))
+            best = None
+            for key in candidates:
+                entry, expires_at = self._memory.entry(key)
+                distance = hamming(fingerprint, entry[2])
+                if expires_at > now and distance <= self.near_bits and (best is None or distance < best[0]):
+                    best = (distance, key, entry[3])
+            if best is not None:
+                self._memory.touch(best[1])
+                return json.loads(best[2])
+        if self._disk.enabled:
+            band_values = bands(fingerprint)
+            try:
+                rows = self._disk.connection().execute(
+                    'SELECT key, fingerprint, value, expires_at FROM results WHERE kind = ? AND config = ? AND expires_at > ? AND ('
+                    + ' OR '.join(f'b{i} = ?' for i in range(BANDS)) + ')',
+                    (kind, config, now, *band_values)
+                ).fetchall()
+            except Exception:
+                rows = []
+            best = None
+            for key, stored, value, expires_at in rows:
+                stored &= (1 << 64) - 1
+                distance = hamming(fingerprint, stored)
+                if distance <= self.near_bits and (best is None or distance < best[0]):
+                    best = (distance, key, stored, value, expires_at)
+            if best is not None:
+                self._remember(best[1], kind, config, best[2], best[3], best[4])
+                return json.loads(best[3])
+        return None
+
+    def set(self, kind, text, config, value):
+        """Store a JSON-serializable result for text under config."""
+        key = content_key(kind, text, config)
+        fingerprint = self._fingerprint(text)
+        encoded = json.dumps(value)
+        expires_at = time.time() + self.ttl
+        self._remember(key, kind, config, fingerprint, encoded, expires_at)
+        with self._lock:
+            self.stats['stores'] += 1
+        if self._disk.enabled:
+            try:
+                band_values = bands(fingerprint) if fingerprint is not None else [None] * BANDS
+                conn = self._disk.connection()
+                conn.execute(
+                    'INSERT OR REPLACE INTO results VALUES (' + ', '.join(['?'] * (BANDS + 6)) + ')',
+                    (key, kind, config, None if fingerprint is None else _signed(fingerprint),
+                     *band_values, encoded, expires_at)
+                )
+                conn.commit()
+            except Exception:
+                pass
+
+    def _remember(self, key, kind, config, fingerprint, encoded, expires_at):
+        with self._lock:
+            self._memory.put(key, (kind, config, fingerprint, encoded), expires_at)
+            if fingerprint is not None:
+                for i, band in enumerate(bands(fingerprint)):
+                    self._bands.setdefault((kind, config, i, band), set()).add(key)
+
+    def _unindex(self, key, entry):
+        # Called by the LRU, under self._lock, as entries are replaced, evicted or expire
+        kind, config, fingerprint, _ = entry
+        if fingerprint is not None:
+            for i, band in enumerate(bands(fingerprint)):
+                keys = self._bands.get((kind, config, i, band))
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del self._bands[(kind, config, i, band)]
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._bands.clear()
+        if self._disk.enabled:
+            conn = self._disk.connection()
+            conn.execute('DELETE FROM results')
+            conn.commit()
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats['memory_entries'] = len(self._memory)
+        lookups = stats['exact_hits'] + stats['near_hits'] + stats['misses']
+        stats['hit_rate'] = (stats['exact_hits'] + stats['near_hits']) / lookups if lookups else 0.0
+        return stats
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+def get_result_cache():
+    """Process-wide result cache shared by /process and /research."""
+    global _shared_cache
+    if _shared_cache is None:
+        with _shared_lock:
+            if _shared_cache is None:
+                _shared_cache = ResultCache()
+    return _shared_cache
@@ -0,0 +1,147 @@
+import itertools
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future
+
+MODEL_WORKERS = int(os.environ.get('RUSTY_MODEL_WORKERS', 0))
+# Per-worker cap on queued batches; submitters block rather than pile up unbounded work
+QUEUE_DEPTH = 2
+
+def _worker_main(index, threads, cpus, requests, results):
+    """Model worker loop: take (job_id, texts, max_length, min_length), send back (job_id, ok, value)."""
+    import torch
+    import init_summarizer
+    torch.set_num_threads(threads)
+    if cpus and hasattr(os, 'sched_setaffinity'):
+        try:
+            os.sched_setaffinity(0, cpus)
+        except OSError:
+            pass
+    # The parent's scheduler thread didn't survive the fork; run batches directly here
+    init_summarizer._scheduler = None
+    summarizer = init_summarizer.Summarizer()
+    while True:
+        job = requests.get()
+        if job is None:
+            return
+        job_id, texts, max_length, min_length = job
+        try:
+            results.put((job_id, True, summarizer._summarize_batches(texts, max_length, min_length)))
+        except Exception as e:
+            results.put((job_id, False, f'{type(e).__name__}: {e}'))
+
+class PreforkSummarizerPool:
+    """Forks model worker processes that share the parent's summarizer weights copy-on-write.
+
+    The model is loaded once in the parent, before any worker exists; fork then
+    gives every worker the same physical pages for the weights, which inference
+    only reads. Each worker gets an equal share of the cores for torch's
+    intra-op threads (pinned with sched_setaffinity where available). Batches go
+    out over a bounded queue and results come back through a dispatcher thread
+    that resolves the caller's Future.
+
+    Must be started before the process starts other threads (fork only copies
+    the calling thread), and only on platforms with fork.
+    """
+
+    def __init__(self, workers=None, queue_depth=QUEUE_DEPTH):
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_depth = queue_depth
+        self._processes = []
+        self._futures = {}
+        self._lock = threading.Lock()
+        self._ids = itertools.count()
+        self._dispatcher = None
+        self.stats = {'batches': 0, 'errors': 0}
+
+    def start(self):
+        os.environ.setdefault('TOKENIZERS_PARALLELISM', 'false')
+        import torch
+        from init_summarizer import get_fast_summarizer, SUMMARY_BACKEND
+        ctx = multiprocessing.get_context('fork')
+        # Load in the parent so workers inherit the weights instead of each loading a copy.
+        # ONNX Runtime sessions own thread pools that don't survive fork, so that backend
+        # loads in each worker instead.
+        if SUMMARY_BACKEND != 'onnx':
+            get_fast_summarizer()
+        torch.set_num_threads(1)
+        cpus = sorted(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else list(range(os.cpu_count() or 1))
+        per_worker = max(1, len(cpus) // self.workers)
+        self._requests = ctx.Queue(maxsize=self.workers * self.queue_depth)
+        self._results = ctx.Queue()
+        for i in range(self.workers):
+            pinned = set(cpus[i * per_worker:(i + 1) * per_worker]) if len(cpus) >= self.workers else None
+            process = ctx.Process(target=_worker_main, name=f'model-worker-{i}',
+                                  args=(i, per_worker, pinned, self._requests, self._results), daemon=True)
+            process.start()
+            self._processes.append(process)
+        self._dispatcher = threading.Thread(target=self._dispatch, name='model-results', daemon=True)
+        self._dispatcher.start()
+        return self
+
+    def submit(self, texts, max_length=40, min_length=10):
+        future = Future()
+        with self._lock:
+            job_id = next(self._ids)
+            self._futures[job_id] = future
+        self._requests.put((job_id, list(texts), max_length, min_length))
+        return future
+
+    def run_batch(self, texts, max_length=40, min_length=10, timeout=120):
+        """BatchScheduler-compatible run_batch that executes on whichever worker is free."""
+        return self.submit(texts, max_length, min_length).result(timeout=timeout)
+
+    def _dispatch(self):
+        while True:
+            item = self._results.get()
+            if item is None:
+                return
+            job_id, ok, value = item
+            with self._lock:
+                future = self._futures.pop(job_id, None)
+                self.stats['batches'] += 1
+                if not ok:
+                    self.stats['errors'] += 1
+            if future is None:
+                continue
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(RuntimeError(value))
+
+    def alive(self):
+        return sum(process.is_alive() for process in self._processes)
+
+    def get_stats(self):
+        with self._lock:
+            return {**self.stats, 'workers': self.workers, 'alive': self.alive(), 'pending': len(self._futures)}
+
+    def close(self):
+        for _ in self._processes:
+            self._requests.put(None)
+        for process in self._processes:
+            process.join(timeout=5)
+        self._results.put(None)
+        if self._dispatcher is not None:
+            self._dispatcher.join()
+
+_pool = None
+
+def start_model_workers(workers=None):
+    """Start the prefork pool and route batched summarization through it.
+
+    Call at startup, before any other threads exist. Returns None (and leaves
+    summarization in-process) when workers resolves to 0.
+    """
+    global _pool
+    from init_summarizer import enable_batching
+    workers = MODEL_WORKERS if workers is None else workers
+    if workers <= 0 or _pool is not None:
+        return _pool
+    _pool = PreforkSummarizerPool(workers).start()
+    enable_batching(run_batch=_pool.run_batch, max_inflight=workers)
+    return _pool
+
+def model_worker_stats():
+    return _pool.get_stats() if _pool is not None else None
@@ -0,0 +1,150 @@
+import functools
+import os
+import sys
+import threading
+
+# Words simplify_text treats as already plain; a complex word is only ever replaced by one of these
+SIMPLE_WORDS = frozenset([
+    'the', 'be', 'to', 'of', 'and', 'a', 'in', 'that', 'have', 'I', 'it', 'for', 'not', 'on', 'with', 'he', 'as', 'you', 'do', 'at',
+    'this', 'but', 'his', 'by', 'from', 'they', 'we', 'say', 'her', 'she', 'or', 'an', 'will', 'my', 'one', 'all', 'would', 'there', 'their',
+    'what', 'so', 'up', 'out', 'if', 'about', 'who', 'get', 'which', 'go', 'me', 'when', 'make', 'can', 'like', 'time', 'no', 'just', 'him', 'know', 'take', 'people', 'into', 'year', 'your', 'good', 'some', 'could', 'them', 'see', 'other', 'than', 'then', 'now', 'look', 'only', 'come', 'its', 'over', 'think', 'also', 'back', 'after', 'use', 'two', 'how', 'our', 'work', 'first', 'well', 'way', 'even', 'new', 'want', 'because', 'any', 'these', 'give', 'day', 'most', 'us'
+])
+
+LEXICON_PATH = os.environ.get(
+    'RUSTY_SIMPLE_LEXICON',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'simple_lexicon.tsv')
+)
+# Set RUSTY_WORDNET_FALLBACK=0 to use only the prebuilt lexicon
+WORDNET_FALLBACK = os.environ.get('RUSTY_WORDNET_FALLBACK', '1') != '0'
+
+def wordnet_simple_synonym(word):
+    """The rule simplify_text has always used: the first lemma of word's first synset, if it's a simple word."""
+    from nltk.corpus import wordnet
+    synsets = wordnet.synsets(word)
+    if not synsets:
+        return None
+    lemma = synsets[0].lemmas()[0].name().replace('_', ' ')
+    if lemma in SIMPLE_WORDS and lemma != word:
+        return lemma
+    return None
+
+def lexicon_entries(extra_words_path=None):
+    """word -> simple synonym for every WordNet lemma (plus an optional word list) that changes.
+
+    The extra list (one word per line, e.g. a corpus vocabulary) is the place for
+    inflected forms, which WordNet resolves through morphy but doesn't list as lemmas.
+    """
+    from nltk.corpus import wordnet
+    words = set(name for name in wordnet.all_lemma_names() if name.isalpha())
+    if extra_words_path:
+        with open(extra_words_path) as f:
+            words.update(line.strip().lower() for line in f if line.strip().isalpha())
+    entries = {}
+    for word in words:
+        if word in SIMPLE_WORDS or len(word) <= 4:
+            continue
+        simple = wordnet_simple_synonym(word)
+        if simple:
+            entries[word] = sys.intern(simple)
+    return entries
+
+def write_lexicon(lexicon_path, entries):
+    # Written to a temporary file first so a concurrent load never sees half a lexicon
+    tmp_path = f'{lexicon_path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w') as f:
+        for word in sorted(entries):
+            f.write(f'{word}\t{entries[word]}\n')
+    os.replace(tmp_path, lexicon_path)
+
+def build_lexicon(lexicon_path, extra_words_path=None):
+    """Precompute the lexicon into lexicon_path; returns the entry count."""
+    entries = lexicon_entries(extra_words_path)
+    write_lexicon(lexicon_path, entries)
+    return len(entries)
+
+def load_lexicon(lexicon_path):
+    table = {}
+    with open(lexicon_path) as f:
+        for line in f:
+            word, _, simple = line.rstrip('\n').partition('\t')
+            if word and simple:
+                # Replacements come from a ~100-word vocabulary, so intern them once
+                table[word] = sys.intern(simple)
+    return table
+
+class SimpleLexicon:
+    """complex word -> simple synonym, answered from the prebuilt table with one dict lookup.
+
+    Words the table doesn't know go to WordNet only when wordnet_fallback is on,
+    and each such answer is memoized.
+    """
+
+    def __init__(self, path=LEXICON_PATH, wordnet_fallback=WORDNET_FALLBACK):
+        self.path = path
+        self.table = load_lexicon(path) if path and os.path.exists(path) else {}
+        self.wordnet_fallback = wordnet_fallback and self._wordnet_available()
+        self._fallback = functools.lru_cache(maxsize=65536)(self._wordnet_lookup)
+
+    @staticmethod
+    def _wordnet_available():
+        try:
+            import nltk
+            nltk.data.find('corpora/wordnet')
+            return True
+        except (ImportError, LookupError):
+            return False
+
+    def ensure_built(self):
+        """Build the table from WordNet if no lexicon file was found; returns the entry count.
+
+        Called from warmup, so a deployment without a prebuilt file pays the build
+        once, in the background, and saves it to path for the next process. Without
+        WordNet there's nothing to build from and the table stays empty.
+        """
+        if self.table or not self._wordnet_available():
+            return len(self.table)
+        entries = lexicon_entries()
+        if self.path:
+            try:
+                write_lexicon(self.path, entries)
+            except OSError as e:
+                print(f" ! Could not save simplification lexicon to {self.path}: {e}", file=sys.stderr)
+        self.table = entries
+        return len(entries)
+
+    def _wordnet_lookup(self, word):
+        try:
+            return wordnet_simple_synonym(word)
+        except Exception:
+            return None
+
+    def lookup(self, word):
+        """Simple synonym for a lowercase word, or None to keep it."""
+        simple = self.table.get(word)
+        if simple is not None or not self.wordnet_fallback:
+            return simple
+        return self._fallback(word)
+
+_lexicon = None
+_lexicon_lock = threading.Lock()
+
+def get_simple_lexicon():
+    """The process-wide lexicon, loaded from LEXICON_PATH on first use."""
+    global _lexicon
+    if _lexicon is None:
+        with _lexicon_lock:
+            if _lexicon is None:
+                _lexicon = SimpleLexicon()
+    return _lexicon
+
+if __name__ == "__main__":
+    if len(sys.argv) in (2, 3, 4) and sys.argv[1] == 'build':
+        out = sys.argv[2] if len(sys.argv) > 2 else LEXICON_PATH
+        n = build_lexicon(out, sys.argv[3] if len(sys.argv) > 3 else None)
+        print(f"Wrote {n} simplifications to {out}", file=sys.stderr)
+    elif len(sys.argv) == 3 and sys.argv[1] == 'lookup':
+        print(get_simple_lexicon().lookup(sys.argv[2].lower()))
+    else:
+        print("usage: simple_lexicon.py build [lexicon.tsv] [extra_words.txt]\n"
+              "       simple_lexicon.py lookup <word>", file=sys.stderr)
+        sys.exit(1)
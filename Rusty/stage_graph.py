@@ -0,0 +1,96 @@
+import concurrent.futures
+from instrumentation import submit
+
+class StopGraph(Exception):
+    """Raised by a stage to end the run early; values produced so far are kept."""
+
+class Stage:
+    """One node: fn is called with its inputs as keyword arguments and produces its outputs.
+
+    With a single output fn returns the value itself; with several it returns a
+    tuple in the order of outputs.
+    """
+
+    def __init__(self, name, fn, inputs=(), outputs=None):
+        self.name = name
+        self.fn = fn
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs) if outputs is not None else (name,)
+
+    def __repr__(self):
+        return f"Stage({self.name!r}, inputs={self.inputs}, outputs={self.outputs})"
+
+class StageGraph:
+    """Runs stages as soon as their inputs exist, independent ones concurrently.
+
+    Each value is produced by exactly one stage (or passed in to run()) and is
+    shared by every stage that reads it, so nothing is computed twice and the run
+    takes as long as its critical path rather than the sum of its stages.
+    """
+
+    def __init__(self, stages):
+        self.stages = list(stages)
+        self.producers = {}
+        for stage in self.stages:
+            for output in stage.outputs:
+                if output in self.producers:
+                    raise ValueError(f"{output!r} is produced by both {self.producers[output].name!r} and {stage.name!r}")
+                self.producers[output] = stage
+        self._check_acyclic()
+
+    def _check_acyclic(self):
+        visiting, done = set(), set()
+
+        def visit(stage):
+            if stage.name in done:
+                return
+            if stage.name in visiting:
+                raise ValueError(f"stage graph has a cycle through {stage.name!r}")
+            visiting.add(stage.name)
+            for name in stage.inputs:
+                if name in self.producers:
+                    visit(self.producers[name])
+            visiting.discard(stage.name)
+            done.add(stage.name)
+
+        for stage in self.stages:
+            visit(stage)
+
+    def run(self, max_workers=4, **values):
+        """Run every stage whose inputs can be satisfied; returns all values by name.
+
+        Inputs not produced by any stage must be passed as keyword arguments. A
+        stage exception other than StopGraph cancels the stages not yet started
+        and is re-raised.
+        """
+        missing = {name for stage in self.stages for name in stage.inputs
+                   if name not in self.producers and name not in values}
+        if missing:
+            raise ValueError(f"no stage produces {', '.join(sorted(missing))}")
+        pending = list(self.stages)
+        running = {}
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='stage')
+        try:
+            while pending or running:
+                for stage in [s for s in pending if all(name in values for name in s.inputs)]:
+                    pending.remove(stage)
+                    # submit carries the request's recorder and deadline into the stage
+                    future = submit(executor, stage.fn, **{name: values[name] for name in stage.inputs})
+                    running[future] = stage
+                if not running:
+                    # Remaining stages wait on values that will never arrive
+                    break
+                done, _ = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    stage = running.pop(future)
+                    try:
+                        result = future.result()
+                    except StopGraph:
+                        return values
+                    if len(stage.outputs) == 1:
+                        values[stage.outputs[0]] = result
+                    else:
+                        values.update(zip(stage.outputs, result))
+            return values
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,94 @@
+"""Check that a CPU summarizer backend stays close to the fp32 torch output.
+
+Summarizes every sentence group in the bundled corpus with both backends and
+reports per-text unigram F1 against fp32 (a ROUGE-1 style overlap), plus the
+latency and resident-memory difference. Exits non-zero when mean F1 drops below
+--min-f1, so it can gate a backend switch.
+
+    python benchmarks/parity.py --backend int8
+    python benchmarks/parity.py --backend onnx --min-f1 0.6
+"""
+import argparse
+import os
+import re
+import resource
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'Rusty'))
+
+from init_summarizer import load_summarizer, BACKENDS, SENTENCE_BREAK
+from run_bench import load_corpus, summarize_samples
+
+def unigram_f1(candidate, reference):
+    cand = re.findall(r"\w+", candidate.lower())
+    ref = re.findall(r"\w+", reference.lower())
+    if not cand or not ref:
+        return float(cand == ref)
+    counts = {}
+    for word in ref:
+        counts[word] = counts.get(word, 0) + 1
+    overlap = 0
+    for word in cand:
+        if counts.get(word, 0) > 0:
+            counts[word] -= 1
+            overlap += 1
+    if not overlap:
+        return 0.0
+    precision, recall = overlap / len(cand), overlap / len(ref)
+    return 2 * precision * recall / (precision + recall)
+
+def sample_texts(corpus, sentences_per_text=3):
+    texts = []
+    for text in corpus.values():
+        sentences = SENTENCE_BREAK.split(text.strip())
+        for start in range(0, len(sentences), sentences_per_text):
+            texts.append(' '.join(sentences[start:start + sentences_per_text]))
+    return texts
+
+def max_rss_mb():
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+def run_backend(backend, texts, max_length, min_length):
+    rss_before = max_rss_mb()
+    summarizer = load_summarizer(backend)
+    rss_model = max_rss_mb() - rss_before
+    summarizer(texts[0], max_length=max_length, min_length=min_length, do_sample=False)
+    outputs, latencies = [], []
+    for text in texts:
+        start = time.perf_counter()
+        outputs.append(summarizer(text, max_length=max_length, min_length=min_length, do_sample=False)[0]['summary_text'])
+        latencies.append(time.perf_counter() - start)
+    return outputs, summarize_samples(latencies), rss_model
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--backend', choices=[b for b in BACKENDS if b != 'torch'], default='int8')
+    parser.add_argument('--max-length', type=int, default=40)
+    parser.add_argument('--min-length', type=int, default=10)
+    parser.add_argument('--min-f1', type=float, default=0.7, help="lowest acceptable mean unigram F1 against fp32")
+    args = parser.parse_args()
+
+    texts = sample_texts(load_corpus())
+    reference, ref_latency, ref_rss = run_backend('torch', texts, args.max_length, args.min_length)
+    candidate, cand_latency, cand_rss = run_backend(args.backend, texts, args.max_length, args.min_length)
+    scores = [unigram_f1(c, r) for c, r in zip(candidate, reference)]
+    mean_f1 = sum(scores) / len(scores)
+
+    print(f"{'texts':24s} {len(texts)}")
+    print(f"{'mean unigram F1':24s} {mean_f1:.3f} (min {min(scores):.3f})")
+    print(f"{'p50 latency torch':24s} {ref_latency['p50']:.4f}s")
+    print(f"{'p50 latency ' + args.backend:24s} {cand_latency['p50']:.4f}s ({cand_latency['p50'] / ref_latency['p50']:.2f}x)")
+    print(f"{'model RSS torch':24s} {ref_rss:.0f} MB")
+    # Peak RSS only grows, so the second backend's figure understates its own footprint
+    print(f"{'extra RSS ' + args.backend:24s} {cand_rss:.0f} MB")
+    for score, text, ref, cand in sorted(zip(scores, texts, reference, candidate))[:3]:
+        print(f"\nF1 {score:.3f}\n  fp32: {ref}\n  {args.backend}: {cand}")
+    if mean_f1 < args.min_f1:
+        print(f"\nFAIL: mean F1 {mean_f1:.3f} below {args.min_f1}", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
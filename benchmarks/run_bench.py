@@ -0,0 +1,233 @@
+"""Offline latency and throughput benchmarks for the Rusty pipeline.
+
+All context and research lookups go to a local stub server (stub_server.py), and
+--fake-summarizer swaps t5-small for a trivial stand-in so the non-model stages
+can be timed on their own. Results are written as JSON; pass --compare with an
+earlier results file to see how p50/p95 moved.
+
+    python benchmarks/run_bench.py --iterations 20 --output before.json
+    python benchmarks/run_bench.py --iterations 20 --output after.json --compare before.json
+"""
+import argparse
+import concurrent.futures
+import json
+import os
+import platform
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+CORPUS_DIR = os.path.join(BENCH_DIR, 'corpus')
+RESEARCH_TOPICS = ['Photosynthesis', 'Quantum computing', 'Green tea']
+
+# Keep benchmark runs away from the user's caches, local index and background warmup
+os.environ['RUSTY_CONTEXT_CACHE'] = os.path.join(tempfile.mkdtemp(prefix='rusty-bench-'), 'contexts.sqlite3')
+os.environ['RUSTY_RESULT_CACHE'] = ''
+os.environ['RUSTY_LOCAL_INDEX'] = ''
+os.environ['RUSTY_WARMUP'] = '0'
+sys.path.insert(0, BENCH_DIR)
+sys.path.insert(0, os.path.join(ROOT, 'Rusty'))
+
+from stub_server import StubServer
+
+class FakeSummarizer:
+    """Stands in for the transformers summarization pipeline: returns the first max_length words."""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+
+    def tokenizer(self, text, truncation=True):
+        return {'input_ids': text.split()}
+
+    def _summary(self, text, max_length):
+        return {'summary_text': ' '.join(text.split()[:max_length])}
+
+    def __call__(self, texts, max_length=40, min_length=10, **kwargs):
+        if self.latency:
+            time.sleep(self.latency)
+        if isinstance(texts, str):
+            return [self._summary(texts, max_length)]
+        return [self._summary(text, max_length) for text in texts]
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of numbers."""
+    ordered = sorted(samples)
+    if not ordered:
+        return None
+    rank = max(1, int(round(pct / 100.0 * len(ordered) + 0.5)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+def summarize_samples(samples):
+    return {
+        'n': len(samples),
+        'mean': round(sum(samples) / len(samples), 5) if samples else None,
+        'p50': round(percentile(samples, 50), 5) if samples else None,
+        'p95': round(percentile(samples, 95), 5) if samples else None,
+        'p99': round(percentile(samples, 99), 5) if samples else None,
+    }
+
+def load_corpus():
+    corpus = {}
+    for name in sorted(os.listdir(CORPUS_DIR)):
+        if name.endswith('.txt'):
+            with open(os.path.join(CORPUS_DIR, name)) as f:
+                corpus[name[:-4]] = f.read()
+    return corpus
+
+def point_sources_at(base_url):
+    """Route every context and research lookup to the stub server."""
+    import fetcher
+    import research_pipeline
+    fetcher._fetcher = fetcher.SourceFetcher(sources=[
+        base_url + '/wiki/',
+        base_url + '/search?q=',
+    ])
+    research_pipeline.WIKIPEDIA_BASES[:] = [base_url + '/wiki/']
+
+class Bench:
+    def __init__(self, iterations, warm):
+        self.iterations = iterations
+        self.warm = warm
+        self.results = {}
+        self.stages = {}
+
+    def _reset(self):
+        if not self.warm:
+            from context_cache import get_shared_cache
+            from result_cache import get_result_cache
+            get_shared_cache().clear()
+            get_result_cache().clear()
+
+    def measure(self, name, fn, stage_timings=None):
+        samples = []
+        stages = {}
+        for _ in range(self.iterations):
+            self._reset()
+            start = time.perf_counter()
+            out = fn()
+            samples.append(time.perf_counter() - start)
+            if stage_timings is not None:
+                for stage, seconds in stage_timings(out).items():
+                    stages.setdefault(stage, []).append(seconds)
+        self.results[name] = summarize_samples(samples)
+        if stages:
+            self.stages[name] = {stage: summarize_samples(values) for stage, values in stages.items()}
+        print(f"{name:40s} p50={self.results[name]['p50']:.4f}s p95={self.results[name]['p95']:.4f}s", file=sys.stderr)
+
+def run_stage_benchmarks(bench, corpus):
+    from main import process_document, get_pipeline
+    from debate_analyzer import DebateAnalyzer
+    from line_separator import LineSeparator
+    from research_pipeline import process_research_topic
+
+    pipeline = get_pipeline()
+    analyzer = DebateAnalyzer()
+    separator = LineSeparator()
+    for name, text in corpus.items():
+        bench.measure(f'process_text/{name}', lambda: process_document(text),
+                      stage_timings=lambda out: out['metrics']['timings'])
+        bench.measure(f'process_text_extractive/{name}', lambda: process_document(text, mode='extractive'),
+                      stage_timings=lambda out: out['metrics']['timings'])
+        bench.measure(f'pipeline_run/{name}', lambda: pipeline.run(text),
+                      stage_timings=lambda out: out.timings)
+        lines = separator.separate(text, mode='strict')
+        bench.measure(f'assign_weights/{name}', lambda: analyzer.assign_weights(lines))
+    for topic in RESEARCH_TOPICS:
+        bench.measure(f'research/{topic}', lambda: process_research_topic(topic))
+
+def run_throughput(corpus, clients, requests_per_client):
+    """Serve the Flask app on a local port and hit /process from concurrent clients."""
+    from werkzeug.serving import make_server
+    os.chdir(ROOT)
+    sys.path.append(ROOT)
+    # The Flask app module is main.py at the repo root; Rusty/main.py is already `main`
+    import importlib.util
+    spec = importlib.util.spec_from_file_location('flask_app', os.path.join(ROOT, 'main.py'))
+    flask_app = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(flask_app)
+    server = make_server('127.0.0.1', 0, flask_app.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f'http://127.0.0.1:{server.server_port}/process'
+    bodies = [json.dumps({'text': text}).encode('utf-8') for text in corpus.values()]
+
+    def client(index):
+        latencies = []
+        for i in range(requests_per_client):
+            req = urllib.request.Request(url, data=bodies[(index + i) % len(bodies)],
+                                         headers={'Content-Type': 'application/json'})
+            start = time.perf_counter()
+            with urllib.request.urlopen(req, timeout=300) as resp:
+                resp.read()
+            latencies.append(time.perf_counter() - start)
+        return latencies
+
+    start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=clients) as executor:
+        latencies = [lat for lats in executor.map(client, range(clients)) for lat in lats]
+    elapsed = time.perf_counter() - start
+    server.shutdown()
+    result = summarize_samples(latencies)
+    result.update({'clients': clients, 'requests': len(latencies), 'requests_per_sec': round(len(latencies) / elapsed, 3)})
+    print(f"throughput ({clients} clients): {result['requests_per_sec']} req/s, p95={result['p95']:.4f}s", file=sys.stderr)
+    return result
+
+def compare(current, baseline_path):
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    print(f"\n{'benchmark':40s} {'p50 before':>11s} {'p50 after':>11s} {'change':>8s}", file=sys.stderr)
+    for name, stats in current['results'].items():
+        before = baseline.get('results', {}).get(name)
+        if not before or not before.get('p50'):
+            continue
+        change = (stats['p50'] - before['p50']) / before['p50'] * 100
+        print(f"{name:40s} {before['p50']:11.4f} {stats['p50']:11.4f} {change:+7.1f}%", file=sys.stderr)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=10)
+    parser.add_argument('--warm', action='store_true', help="keep the context and result caches between iterations")
+    parser.add_argument('--fake-summarizer', action='store_true', help="replace t5-small with a trivial stand-in")
+    parser.add_argument('--fake-latency-ms', type=float, default=0.0, help="per-call delay for the fake summarizer")
+    parser.add_argument('--stub-delay-ms', type=float, default=0.0, help="per-request delay on the stub server")
+    parser.add_argument('--stub-error-rate', type=float, default=0.0, help="fraction of stub requests answered with 503")
+    parser.add_argument('--clients', type=int, default=0, help="concurrent /process clients for the throughput run (0 skips it)")
+    parser.add_argument('--requests-per-client', type=int, default=5)
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--compare', help="earlier results file to diff against")
+    args = parser.parse_args()
+
+    if args.fake_summarizer:
+        import init_summarizer
+        init_summarizer._fast_summarizer = FakeSummarizer(latency=args.fake_latency_ms / 1000.0)
+
+    corpus = load_corpus()
+    with StubServer(delay=args.stub_delay_ms / 1000.0, error_rate=args.stub_error_rate) as stub:
+        point_sources_at(stub.base_url)
+        bench = Bench(args.iterations, args.warm)
+        run_stage_benchmarks(bench, corpus)
+        throughput = run_throughput(corpus, args.clients, args.requests_per_client) if args.clients else None
+
+    output = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'cpus': os.cpu_count(),
+            'args': vars(args),
+        },
+        'results': bench.results,
+        'stages': bench.stages,
+        'throughput': throughput,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(output, f, indent=2)
+    print(f"\nWrote {args.output}", file=sys.stderr)
+    if args.compare:
+        compare(output, args.compare)
+
+if __name__ == "__main__":
+    main()
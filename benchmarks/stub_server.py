@@ -0,0 +1,81 @@
+"""Local stand-in for Wikipedia and the other context sources, for offline benchmarks.
+
+Every /wiki/<Title> path returns a canned article with a lead paragraph and a few
+named sections, so keyword and research lookups always succeed without the network.
+Search-style paths get a short page with one paragraph. Delays and error rates can
+be injected to mimic slow or failing hosts.
+"""
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlparse, parse_qs
+
+SECTIONS = ['Definition', 'Overview', 'History', 'Derivation']
+
+def article_html(title):
+    name = title.replace('_', ' ')
+    body = [f"<p>{name} is a subject described in this canned article so that benchmark lookups have "
+            f"a realistic lead paragraph to parse, summarize and compare against input lines.</p>"]
+    for section in SECTIONS:
+        body.append(f'<div class="mw-heading"><h2 id="{section}">{section}</h2></div>')
+        body.append(f"<p>The {section.lower()} of {name} is covered here in a paragraph long enough to pass "
+                    f"the minimum length checks used by the pipeline when it extracts section text.</p>")
+    return f"<html><head><title>{name}</title></head><body>{''.join(body)}</body></html>"
+
+def search_html(query):
+    return (f"<html><body><p>Search results for {query}: several publications discuss {query} "
+            f"and related topics in some detail.</p></body></html>")
+
+class StubHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        if server.delay:
+            time.sleep(server.delay)
+        if server.error_rate and random.random() < server.error_rate:
+            self.send_response(503)
+            self.end_headers()
+            return
+        url = urlparse(self.path)
+        if url.path.startswith('/wiki/'):
+            html = article_html(unquote(url.path[len('/wiki/'):]))
+        else:
+            html = search_html(parse_qs(url.query).get('q', [url.path.strip('/')])[0])
+        data = html.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+class StubServer:
+    """Runs the stub on a free localhost port in a background thread."""
+
+    def __init__(self, delay=0.0, error_rate=0.0):
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.delay = delay
+        self.httpd.error_rate = error_rate
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address
+        return f'http://{host}:{port}'
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -1,13 +1,76 @@
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Response, request, jsonify, send_from_directory, stream_with_context
 from flask_cors import CORS
+import json
+import os
 import sys
+import threading
 sys.path.append('./Rusty')
-from Rusty.main import process_text
+from Rusty.main import process_document, stream_process_text, process_batch, parse_jsonl_documents, warmup, is_ready, get_metrics
 from Rusty.research_pipeline import process_research_topic
+from init_summarizer import enable_batching
+from serving import start_model_workers, MODEL_WORKERS
+from profiling import profiling
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS so JS from file:// or other origins can talk to Flask
 
+# With forked model workers the reloader stays off: every code change would load
+# the model and fork all the workers again
+USE_RELOADER = MODEL_WORKERS <= 0
+
+# Under the debug reloader `python main.py` runs this module twice: in the file watcher,
+# which never serves a request, and in the child it (re)starts. Only the child loads models.
+RELOADER_WATCHER = __name__ == '__main__' and USE_RELOADER and os.environ.get('WERKZEUG_RUN_MAIN') != 'true'
+
+if not RELOADER_WATCHER:
+    # RUSTY_MODEL_WORKERS=N loads T5 once and forks N worker processes sharing its weights;
+    # this has to happen before any other thread is started
+    start_model_workers()
+
+    # Concurrent /process and /research calls share T5 forward passes instead of queueing on the model
+    # (window via RUSTY_BATCH_WINDOW_MS)
+    enable_batching()
+
+    # Load models in the background so the server starts accepting connections immediately;
+    # /ready reports when the first request won't pay the model load (RUSTY_WARMUP=0 to skip)
+    if os.environ.get('RUSTY_WARMUP', '1') != '0':
+        threading.Thread(target=warmup, name='warmup', daemon=True).start()
+
+def request_budget_ms(data=None):
+    """Latency budget from ?budget_ms= (or "budget_ms" in the JSON body); None if absent or invalid."""
+    value = request.args.get("budget_ms")
+    if value is None and data:
+        value = data.get("budget_ms")
+    try:
+        budget = float(value)
+    except (TypeError, ValueError):
+        return None
+    return budget if budget > 0 else None
+
+def profile_requested():
+    """Whether the caller asked for a profile, via an X-Profile: 1 header or ?profile=1."""
+    value = request.headers.get("X-Profile", request.args.get("profile", ""))
+    return value.lower() in ("1", "true", "yes")
+
+def run_profiled(fn, *args, **kwargs):
+    """fn's result dict, plus its collapsed-stack profile under "profile" if one was requested."""
+    if not profile_requested():
+        return fn(*args, **kwargs)
+    with profiling() as profile:
+        result = dict(fn(*args, **kwargs))
+    result["profile"] = profile.collapsed()
+    return result
+
+@app.route('/ready')
+def ready_route():
+    if is_ready():
+        return jsonify({"ready": True})
+    return jsonify({"ready": False}), 503
+
+@app.route('/metrics')
+def metrics_route():
+    return jsonify(get_metrics())
+
 @app.route('/process', methods=['POST'])
 def process_text_route():
     data = request.get_json()
@@ -15,12 +78,46 @@ def process_text_route():
     if not input_text.strip():
         return jsonify({"output": "⚠️ No input text provided."})
     try:
-        # Use the Rusty/main.py process_text function
-        summary, definitions = process_text(input_text, return_definitions=True)
-        return jsonify({"summary": summary, "definitions": definitions})
+        # Summary, definitions and this request's stage timings/counters;
+        # "mode": "extractive" skips the model entirely; with a budget_ms, stages that won't
+        # fit are degraded and listed under "degraded"; X-Profile: 1 adds a sampled profile
+        return jsonify(run_profiled(process_document, input_text, mode=data.get("mode", "abstractive"),
+                                    budget_ms=request_budget_ms(data)))
     except Exception as e:
         return jsonify({"output": f"Error: {str(e)}"})
 
+@app.route('/process/stream', methods=['POST'])
+def process_stream_route():
+    data = request.get_json()
+    input_text = data.get("text", "")
+    if not input_text.strip():
+        return jsonify({"output": "⚠️ No input text provided."})
+    # Same "mode" and budget_ms options as /process
+    mode = data.get("mode", "abstractive")
+    budget_ms = request_budget_ms(data)
+    # One JSON object per line (NDJSON): weighted lines as they finish, then definitions and the summary
+    def generate():
+        for event in stream_process_text(input_text, mode=mode, budget_ms=budget_ms):
+            yield json.dumps(event) + "\n"
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+@app.route('/process/batch', methods=['POST'])
+def process_batch_route():
+    # Either {"documents": [{"id", "text"} | "text", ...]} or an NDJSON body with one document per line
+    mode = request.args.get("mode", "abstractive")
+    # Applies to each document separately
+    budget_ms = request_budget_ms()
+    if request.is_json:
+        documents = request.get_json().get("documents", [])
+        documents = parse_jsonl_documents(json.dumps(document) for document in documents)
+    else:
+        documents = parse_jsonl_documents(request.stream)
+    # One NDJSON result per document, in input order, each sent as soon as it and its predecessors finish
+    def generate():
+        for result in process_batch(documents, mode=mode, budget_ms=budget_ms):
+            yield json.dumps(result) + "\n"
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
 @app.route('/research', methods=['POST'])
 def research_route():
     data = request.get_json()
@@ -29,7 +126,7 @@ def research_route():
         return jsonify({"output": "⚠️ No research topic provided."})
     try:
         # Use a new research pipeline for structured research output
-        result = process_research_topic(topic)
+        result = run_profiled(process_research_topic, topic)
         return jsonify(result)
     except Exception as e:
         return jsonify({"output": f"Error: {str(e)}"})
@@ -43,4 +140,4 @@ def static_files(filename):
     return send_from_directory('.', filename)
 
 if __name__ == '__main__':
-    app.run(debug=True, port=5000)
+    app.run(debug=True, port=5000, threaded=True, use_reloader=USE_RELOADER)
@@ -37,42 +37,101 @@ function hideLoadingOverlay() {
   }, 400);
 }
 
-document.getElementById('summarizer-form').addEventListener('submit', function(e) {
+function escapeHtml(text) {
+  const div = document.createElement('div');
+  div.textContent = text;
+  return div.innerHTML;
+}
+
+// Get (or create) a result box that sits below the textbox
+function resultBox(id, inputBox) {
+  let box = document.getElementById(id);
+  if (!box) {
+    box = document.createElement('div');
+    box.id = id;
+    inputBox.parentNode.appendChild(box);
+  }
+  return box;
+}
+
+function renderDefinitions(definitions, inputBox) {
+  const defsDiv = resultBox('definitions-box', inputBox);
+  let html = '<b>Key Terms:</b><ul>';
+  for (const [word, def] of Object.entries(definitions)) {
+    html += `<li><b>${word}:</b> ${def}</li>`;
+  }
+  html += '</ul>';
+  defsDiv.innerHTML = html;
+}
+
+function renderWeightedLine(event, inputBox) {
+  const linesDiv = resultBox('weighted-lines-box', inputBox);
+  if (!linesDiv.firstChild) linesDiv.innerHTML = '<b>Statements:</b><ul></ul>';
+  const item = document.createElement('li');
+  const text = event.line.split('\n[Citations:')[0];
+  item.innerHTML = `<b>${(event.confidence * 100).toFixed(0)}%</b> ${escapeHtml(text)}`;
+  linesDiv.querySelector('ul').appendChild(item);
+}
+
+function handleStreamEvent(event, inputBox) {
+  if (event.type === 'line') {
+    renderWeightedLine(event, inputBox);
+  } else if (event.type === 'definitions') {
+    renderDefinitions(event.definitions, inputBox);
+  } else if (event.type === 'summary') {
+    inputBox.value = event.summary;
+  } else if (event.type === 'error') {
+    inputBox.value = 'Error: ' + event.error;
+  }
+}
+
+document.getElementById('summarizer-form').addEventListener('submit', async function(e) {
     e.preventDefault();
     const inputBox = document.getElementById('raw_in');
     const inputText = inputBox.value;
+    for (const id of ['definitions-box', 'weighted-lines-box']) {
+        const box = document.getElementById(id);
+        if (box) box.innerHTML = '';
+    }
     showLoadingOverlay();
-    fetch('/process', {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ text: inputText })
-    })
-    .then(res => res.json())
-    .then(data => {
-        inputBox.value = data.summary || data.output;
-        // Show definitions below the textbox if present
-        let defsDiv = document.getElementById('definitions-box');
-        if (data.definitions) {
-            if (!defsDiv) {
-                defsDiv = document.createElement('div');
-                defsDiv.id = 'definitions-box';
-                inputBox.parentNode.appendChild(defsDiv);
-            }
-            let html = '<b>Key Terms:</b><ul>';
-            for (const [word, def] of Object.entries(data.definitions)) {
-                html += `<li><b>${word}:</b> ${def}</li>`;
+    try {
+        // Results arrive as newline-delimited JSON events; render each one as it lands
+        const res = await fetch('/process/stream', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ text: inputText })
+        });
+        if (!res.headers.get('Content-Type').includes('ndjson')) {
+            const data = await res.json();
+            inputBox.value = data.summary || data.output;
+            hideLoadingOverlay();
+            return;
+        }
+        const reader = res.body.getReader();
+        const decoder = new TextDecoder();
+        let buffered = '';
+        let first = true;
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffered += decoder.decode(value, { stream: true });
+            const parts = buffered.split('\n');
+            buffered = parts.pop();
+            for (const part of parts) {
+                if (!part.trim()) continue;
+                if (first) {
+                    hideLoadingOverlay();
+                    first = false;
+                }
+                handleStreamEvent(JSON.parse(part), inputBox);
             }
-            html += '</ul>';
-            defsDiv.innerHTML = html;
-        } else if (defsDiv) {
-            defsDiv.innerHTML = '';
         }
+        if (buffered.trim()) handleStreamEvent(JSON.parse(buffered), inputBox);
         hideLoadingOverlay();
-    })
-    .catch(err => {
+    } catch (err) {
         inputBox.value = 'Error: ' + err;
         hideLoadingOverlay();
-    });
+    }
 });
 
 // Research mode tab logic
@@ -0,0 +1,52 @@
+import os
+import runpy
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'Rusty'))
+sys.path.insert(0, ROOT)
+
+pytest.importorskip("flask")
+pytest.importorskip("flask_cors")
+
+import flask
+import init_summarizer
+import serving
+import Rusty.main
+
+def _run_app(monkeypatch, workers, run_main=None):
+    """Execute main.py as `python main.py` would, recording startup calls instead of serving."""
+    calls = []
+    monkeypatch.chdir(ROOT)
+    monkeypatch.setattr(serving, "MODEL_WORKERS", workers)
+    monkeypatch.setattr(serving, "start_model_workers", lambda: calls.append("start_model_workers"))
+    monkeypatch.setattr(init_summarizer, "enable_batching", lambda: calls.append("enable_batching"))
+    monkeypatch.setattr(Rusty.main, "warmup", lambda: calls.append("warmup"))
+    monkeypatch.setattr(flask.Flask, "run", lambda app, **kwargs: calls.append(("run", kwargs["use_reloader"])))
+    monkeypatch.setenv("RUSTY_WARMUP", "1")
+    if run_main is None:
+        monkeypatch.delenv("WERKZEUG_RUN_MAIN", raising=False)
+    else:
+        monkeypatch.setenv("WERKZEUG_RUN_MAIN", run_main)
+    module = runpy.run_path(os.path.join(ROOT, "main.py"), run_name="__main__")
+    # warmup runs on a background thread
+    for thread in [t for t in module["threading"].enumerate() if t.name == "warmup"]:
+        thread.join(timeout=5)
+    return calls
+
+def test_workers_start_without_reloader(monkeypatch):
+    calls = _run_app(monkeypatch, workers=2)
+    assert calls[:2] == ["start_model_workers", "enable_batching"]
+    assert "warmup" in calls
+    assert ("run", False) in calls
+
+def test_reloader_watcher_skips_startup(monkeypatch):
+    calls = _run_app(monkeypatch, workers=0)
+    assert calls == [("run", True)]
+
+def test_reloader_child_starts_up(monkeypatch):
+    calls = _run_app(monkeypatch, workers=0, run_main="true")
+    assert calls[:2] == ["start_model_workers", "enable_batching"]
+    assert "warmup" in calls
@@ -0,0 +1,46 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Rusty'))
+
+from context_cache import ContextCache, MISS
+from result_cache import ResultCache
+
+ARTICLE = ' '.join(f'Lemons improve eyesight claim number {i} spreads across social media feeds.' for i in range(6))
+
+def test_context_cache_disk_tier_survives_a_new_instance(tmp_path):
+    path = str(tmp_path / 'contexts.sqlite3')
+    cache = ContextCache(path=path)
+    cache.set('Entropy', 'Entropy is a measure of disorder.')
+    cache.set('Nothing', None)
+    fresh = ContextCache(path=path)
+    assert fresh.get('entropy') == 'Entropy is a measure of disorder.'
+    assert fresh.get('nothing') is MISS
+    assert fresh.get_stats()['disk_hits'] == 2
+    assert fresh.get('entropy') == 'Entropy is a measure of disorder.'
+    assert fresh.get_stats()['memory_hits'] == 1
+
+def test_context_cache_expires_memory_entries():
+    cache = ContextCache(path='', ttl=0.05, negative_ttl=0.05)
+    cache.set('Entropy', 'Entropy is a measure of disorder.')
+    time.sleep(0.1)
+    assert cache.get('Entropy') is None
+    assert cache.get_or_fetch('Entropy', lambda keyword: 'refetched') == 'refetched'
+
+def test_result_cache_near_duplicates_from_memory_and_disk(tmp_path):
+    path = str(tmp_path / 'results.sqlite3')
+    cache = ResultCache(path=path)
+    cache.set('process', ARTICLE, 'cfg', {'summary': 'lemons'})
+    edited = ARTICLE + ' Indeed.'
+    assert cache.get('process', edited, 'cfg') == {'summary': 'lemons'}
+    assert ResultCache(path=path).get('process', edited, 'cfg') == {'summary': 'lemons'}
+    assert cache.get('process', edited, 'other') is None
+
+def test_result_cache_eviction_drops_band_index():
+    cache = ResultCache(path='', max_entries=1)
+    cache.set('process', ARTICLE, 'cfg', {'summary': 'first'})
+    cache.set('process', 'A short different text.', 'cfg', {'summary': 'second'})
+    assert cache._bands == {}
+    assert cache.get('process', ARTICLE + ' Indeed.', 'cfg') is None
+    assert cache.get('process', 'a short  different text.', 'cfg') == {'summary': 'second'}
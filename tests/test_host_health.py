@@ -0,0 +1,102 @@
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'Rusty'))
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+import keyword_dejargonifier
+from context_cache import ContextCache, MISS
+from fetcher import FetchIncomplete, SourceFetcher
+from host_health import HostHealth, HostHealthRegistry, HostUnavailable
+from stub_server import StubServer
+
+def _trip(registry, url, failures=5):
+    for _ in range(failures):
+        assert registry.get(url).status_code == 503
+
+def test_breaker_trips_after_failures_and_skips_host():
+    registry = HostHealthRegistry(min_requests=5, cooldown=30)
+    with StubServer(error_rate=1.0) as server:
+        url = server.base_url + '/wiki/Entropy'
+        _trip(registry, url)
+        health = registry.for_url(url)
+        assert health.state == HostHealth.OPEN
+        start = time.monotonic()
+        with pytest.raises(HostUnavailable):
+            registry.get(url)
+        assert time.monotonic() - start < 0.05
+        assert health.stats['trips'] == 1
+        assert health.stats['rejected'] == 1
+
+def test_half_open_probe_closes_or_reopens_breaker():
+    registry = HostHealthRegistry(min_requests=5, cooldown=0.2)
+    with StubServer(error_rate=1.0) as server:
+        url = server.base_url + '/wiki/Entropy'
+        health = registry.for_url(url)
+        _trip(registry, url)
+        time.sleep(0.25)
+        # Still failing: the probe re-opens the breaker
+        assert registry.get(url).status_code == 503
+        assert health.state == HostHealth.OPEN
+        assert health.stats['trips'] == 2
+        server.httpd.error_rate = 0.0
+        time.sleep(0.25)
+        # Recovered: the probe closes it again
+        assert registry.get(url).status_code == 200
+        assert health.state == HostHealth.CLOSED
+        assert registry.get(url).status_code == 200
+
+def test_in_flight_cap_rejects_excess_requests():
+    registry = HostHealthRegistry(max_in_flight=2, queue_timeout=0.05)
+    outcomes = []
+    lock = threading.Lock()
+    with StubServer(delay=0.3) as server:
+        url = server.base_url + '/wiki/Entropy'
+
+        def fetch():
+            try:
+                registry.get(url)
+                outcome = 'ok'
+            except HostUnavailable:
+                outcome = 'rejected'
+            with lock:
+                outcomes.append(outcome)
+
+        threads = [threading.Thread(target=fetch) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    assert sorted(outcomes) == ['ok', 'ok', 'rejected', 'rejected']
+    assert registry.for_url(url).in_flight == 0
+
+def test_unavailable_sources_are_not_cached_as_misses(monkeypatch):
+    monkeypatch.setattr(keyword_dejargonifier, '_stop_words', set())
+    registry = HostHealthRegistry(min_requests=5, cooldown=30)
+    with StubServer(error_rate=1.0) as server:
+        _trip(registry, server.base_url + '/wiki/Entropy')
+        fetcher = SourceFetcher(sources=[server.base_url + '/wiki/'], health=registry, deadline=2)
+        with pytest.raises(FetchIncomplete):
+            fetcher.fetch_first('Entropy')
+        cache = ContextCache(path='')
+        dejargonifier = keyword_dejargonifier.KeywordDejargonifier(cache=cache, fetcher=fetcher, local_index=None, live=True)
+        assert dejargonifier.fetch_context('Entropy') is None
+        assert cache.get('Entropy') is None
+        fetcher.close()
+
+def test_empty_answers_are_still_cached_as_misses(monkeypatch):
+    monkeypatch.setattr(keyword_dejargonifier, '_stop_words', set())
+    with StubServer() as server:
+        # Every source answers, just without a usable paragraph: a genuine miss
+        monkeypatch.setattr('fetcher.first_paragraph', lambda html, min_length=40: None)
+        fetcher = SourceFetcher(sources=[server.base_url + '/wiki/'], health=HostHealthRegistry(), deadline=2)
+        cache = ContextCache(path='')
+        dejargonifier = keyword_dejargonifier.KeywordDejargonifier(cache=cache, fetcher=fetcher, local_index=None, live=True)
+        assert dejargonifier.fetch_context('Entropy') is None
+        assert cache.get('Entropy') is MISS
+        fetcher.close()
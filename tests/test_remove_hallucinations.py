@@ -0,0 +1,54 @@
+import os
+import re
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Rusty'))
+
+from main import Pipeline
+
+def baseline_remove_hallucinations(summary, source_text):
+    """remove_hallucinations as it was before the single-pass matcher, for comparison."""
+    hallucinated_patterns = [
+        r"i'?m not a big fan[,.]?", r"says [A-Za-z]+", r"according to", r"warns", r"claims", r"study", r"experts?", r"scientists?", r"doctors?", r"alleges?", r"confirms?", r"allegedly", r"reported", r"reportedly", r"research", r"findings", r"evidence", r"concludes?", r"conclusion", r"concluded that", r"concludes that", r"according to [A-Za-z ]+", r"according to the study", r"according to the research"
+    ]
+    for pat in hallucinated_patterns:
+        matches = re.findall(pat, summary, flags=re.IGNORECASE)
+        for m in matches:
+            if m.lower() not in source_text.lower():
+                summary = re.sub(re.escape(m), '', summary, flags=re.IGNORECASE)
+    summary = re.sub(r'\s+', ' ', summary).strip()
+    summary = re.sub(r'\s+([.,!?])', r'\1', summary)
+    return summary
+
+CASES = [
+    ("Lemons improve eyesight according to a viral post shared by millions of users.",
+     "Lemons improve eyesight, says a new viral post."),
+    ("Lemons improve eyesight according to a viral post shared by millions of users.",
+     "According to the post, lemons improve eyesight."),
+    ("Lemons improve eyesight according to the post, lemons improve eyesight.",
+     "According to the post, lemons improve eyesight. Doctors disagree."),
+    ("Doctors warn the claims lack evidence, says Smith.",
+     "Doctors warn that the claims lack evidence."),
+    ("I'm not a big fan, but the research shows lemons help.",
+     "Lemons help, the research shows."),
+    ("Experts say the scientists confirmed it, it was reported.",
+     "The scientists confirmed it."),
+    ("The trial is finished and nothing was invented.",
+     "The trial is finished and nothing was invented."),
+    ("It works, according to.", "It works."),
+]
+
+@pytest.mark.parametrize("summary,source", CASES)
+def test_matches_baseline(summary, source):
+    assert Pipeline.remove_hallucinations(None, summary, source) == baseline_remove_hallucinations(summary, source)
+
+@pytest.mark.parametrize("summary,expected,baseline", [
+    ("The team concluded that lemons help.", "The team lemons help.", "The team d that lemons help."),
+    ("It reportedly helps.", "It helps.", "It ly helps."),
+])
+def test_longer_phrasings_are_dropped_whole(summary, expected, baseline):
+    # The intended differences from the baseline, which cut a prefix and left its tail behind
+    assert Pipeline.remove_hallucinations(None, summary, "Lemons help.") == expected
+    assert baseline_remove_hallucinations(summary, "Lemons help.") == baseline
@@ -0,0 +1,27 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Rusty'))
+
+import simple_lexicon
+from simple_lexicon import SimpleLexicon
+
+def test_ensure_built_builds_and_saves_missing_lexicon(tmp_path, monkeypatch):
+    path = str(tmp_path / 'simple_lexicon.tsv')
+    monkeypatch.setattr(SimpleLexicon, '_wordnet_available', staticmethod(lambda: True))
+    monkeypatch.setattr(simple_lexicon, 'lexicon_entries', lambda extra_words_path=None: {'utilize': 'use'})
+    lexicon = SimpleLexicon(path=path, wordnet_fallback=False)
+    assert lexicon.lookup('utilize') is None
+    assert lexicon.ensure_built() == 1
+    assert lexicon.lookup('utilize') == 'use'
+    # The next process loads the saved file instead of rebuilding
+    monkeypatch.setattr(simple_lexicon, 'lexicon_entries', lambda extra_words_path=None: {})
+    reloaded = SimpleLexicon(path=path, wordnet_fallback=False)
+    assert reloaded.lookup('utilize') == 'use'
+    assert reloaded.ensure_built() == 1
+
+def test_ensure_built_without_wordnet_leaves_table_empty(tmp_path, monkeypatch):
+    monkeypatch.setattr(SimpleLexicon, '_wordnet_available', staticmethod(lambda: False))
+    lexicon = SimpleLexicon(path=str(tmp_path / 'simple_lexicon.tsv'), wordnet_fallback=False)
+    assert lexicon.ensure_built() == 0
+    assert not os.path.exists(tmp_path / 'simple_lexicon.tsv')
@@ -0,0 +1,55 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Rusty'))
+
+import main
+from result_cache import ResultCache
+
+class FakeResult:
+    summary = "Streams carry the summary last."
+
+class FakePipeline:
+    def run(self, doc, on_line=None):
+        for index, line in enumerate(doc.text.split('\n')):
+            on_line(index, line, 0.9)
+        return FakeResult()
+
+def _stub(monkeypatch):
+    cache = ResultCache(path='')
+    monkeypatch.setattr(main, "get_pipeline", lambda: FakePipeline())
+    monkeypatch.setattr(main, "get_result_cache", lambda: cache)
+    monkeypatch.setattr(main, "fetch_definitions", lambda doc, executor: {"streams": "Streams deliver events."})
+
+def test_stream_yields_lines_definitions_summary_and_metrics(monkeypatch):
+    _stub(monkeypatch)
+    events = list(main.stream_process_text("First claim here.\nSecond claim here."))
+    types = [event["type"] for event in events]
+    assert "error" not in types
+    assert [event["line"] for event in events if event["type"] == "line"] == ["First claim here.", "Second claim here."]
+    assert {"type": "definitions", "definitions": {"streams": "Streams deliver events."}} in events
+    assert types[-2:] == ["summary", "metrics"]
+    assert events[-2]["summary"] == "Streams carry the summary last."
+    assert events[-1]["degraded"] == []
+
+def test_stream_honours_extractive_mode(monkeypatch):
+    _stub(monkeypatch)
+    events = list(main.stream_process_text("Only one sentence to keep.", mode="extractive"))
+    assert [event["type"] for event in events] == ["definitions", "summary", "metrics"]
+    assert events[1]["summary"] == "Only one sentence to keep."
+
+def test_stream_replays_lines_on_cache_hit(monkeypatch):
+    _stub(monkeypatch)
+    text = "\n".join(f"Claim number {i} says lemons improve eyesight for most adult readers." for i in range(5))
+    fresh = list(main.stream_process_text(text))
+    fresh_lines = [event for event in fresh if event["type"] == "line"]
+    assert len(fresh_lines) == 5
+    # Served from the cache from here on: exact repeats and near-duplicates alike
+    monkeypatch.setattr(main, "get_pipeline", lambda: None)
+    for repeat in (text, text + " Indeed."):
+        cached = list(main.stream_process_text(repeat))
+        assert "error" not in [event["type"] for event in cached]
+        assert [event for event in cached if event["type"] == "line"] == fresh_lines
+        assert [event["type"] for event in cached][-2:] == ["summary", "metrics"]
+    stats = main.get_result_cache().get_stats()
+    assert (stats["exact_hits"], stats["near_hits"]) == (1, 1)
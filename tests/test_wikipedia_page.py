@@ -0,0 +1,21 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'Rusty'))
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+from research_pipeline import WikipediaPage
+from stub_server import SECTIONS, article_html
+
+def test_sections_index_each_heading_once():
+    page = WikipediaPage(article_html('Entropy'))
+    assert list(page.sections) == [name.lower() for name in SECTIONS]
+    assert all(len(paragraphs) == 1 for paragraphs in page.sections.values())
+
+def test_section_lookup_exact_partial_and_missing():
+    page = WikipediaPage(article_html('Entropy'))
+    assert page.section('History').startswith('The history of Entropy')
+    assert page.section('deriv').startswith('The derivation of Entropy')
+    assert page.section('Reception') == page.lead()
+    assert page.lead().startswith('Entropy is a subject')